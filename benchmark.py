@@ -0,0 +1,407 @@
+"""
+처리 파이프라인 벤치마크 (합성 기사 데이터)
+- config 키워드/소스 기반 한글(네이버) + 영문(구글) 기사 생성
+- 단계별 실행 시간 + 최대 메모리(tracemalloc) 측정
+- JSON 기준값 저장/비교로 성능 저하 확인
+
+사용:
+    python benchmark.py --sizes 1000 10000 100000 --save benchmark_baseline.json
+    python benchmark.py --compare benchmark_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pandas as pd
+
+from config import KEYWORDS, SOURCE_PRIORITY, SCORE_CONFIG
+from condenser import condense_text, count_tokens
+from crawler import is_korean, add_date_columns, filter_by_date, aggregate_stories, compact_articles
+from processor import (
+    match_keywords, remove_duplicates_by_similarity, calculate_strategy_score,
+    rank_with_candidate_pool, rerank,
+)
+
+
+# ============================================================
+# 합성 기사 생성
+# ============================================================
+KO_TEMPLATES = [
+    "{company}, {product} 증설 추진",
+    "{product} 가격 약세 지속…{company} 수익성 악화",
+    "{company} {product} 신규 공장 가동",
+    "중국발 {product} 공급 과잉, {company} 감산 검토",
+    "{company}, 2분기 {product} 스프레드 개선",
+]
+EN_TEMPLATES = [
+    "{company} raises {product} prices in Asia",
+    "{product} demand weakens as {company} cuts run rates",
+    "{company} starts up new {product} plant",
+    "Asia {product} margins recover; {company} eyes expansion",
+    "{company} to restructure {product} business",
+]
+KO_FILLER = "시장 가격 수요 공급 공장 증설 수출 실적 전망 원료 나프타 스프레드 감산 가동률".split()
+EN_FILLER = "market prices demand supply plant capacity exports earnings outlook feedstock naphtha margins".split()
+EN_SOURCES = [s for s in SOURCE_PRIORITY if not is_korean(s)] + ["Nikkei Asia", "Argus Media"]
+
+# 기사별 고유 어휘 (실제 기사처럼 넓은 어휘 분포, 유사도 클러스터가 과도하게 커지지 않게)
+VOCABULARY_SIZE = 20000
+
+
+def build_vocabulary(rng, korean):
+    """의사 단어 목록 (한글 음절 2~3자 / 영문 4~9자)"""
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        if korean:
+            words.add("".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 3))))
+        else:
+            words.add("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9))))
+    return sorted(words)
+
+
+# 상대 시간 (구글 일부 기사)
+RELATIVE_DATES = ["3 hours ago", "1 day ago", "2 days ago", "5시간 전", "3일 전"]
+
+
+def split_keywords(categories):
+    """카테고리 키워드 → (한글, 영문) 목록"""
+    korean, english = [], []
+    for category in categories:
+        for keyword in KEYWORDS[category]:
+            (korean if is_korean(keyword) else english).append(keyword)
+    return korean or english, english or korean
+
+
+def generate_articles(n, seed=42, days=10, duplicate_rate=0.2, now=None):
+    """
+    수집 히트 형태의 합성 DataFrame (crawl_all 집계 전)
+    - 네이버: 한글 제목/스니펫, RFC 822 (+0900) 날짜
+    - 구글: 영문 제목, snippet 없음, GMT 날짜 또는 상대 시간
+    - duplicate_rate: 같은 링크 재수집 (다른 키워드 히트) 비율
+    - 일부 기사는 같은 사건을 다른 매체가 보도 (유사도 중복)
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    kst = timezone(timedelta(hours=9))
+    
+    products = [c for c in KEYWORDS if c in ("PE", "PP", "PO", "POE", "POP", "EVA")] or list(KEYWORDS)
+    companies = [c for c in KEYWORDS if c not in products]
+    ko_products, en_products = split_keywords(products)
+    ko_companies, en_companies = split_keywords(companies)
+    categories = list(KEYWORDS)
+    ko_words = build_vocabulary(rng, korean=True)
+    en_words = build_vocabulary(rng, korean=False)
+    
+    rows = []
+    for i in range(n):
+        # 재수집: 이전 기사를 다른 키워드로 다시 히트
+        if rows and rng.random() < duplicate_rate:
+            hit = dict(rng.choice(rows))
+            hit["category"] = rng.choice(categories)
+            hit["keyword"] = rng.choice(KEYWORDS[hit["category"]])
+            rows.append(hit)
+            continue
+        
+        category = rng.choice(categories)
+        keyword = rng.choice(KEYWORDS[category])
+        published = now - timedelta(hours=rng.random() * 24 * days)
+        
+        # 같은 사건 재보도 (제목 일부만 다름)
+        if rows and rng.random() < 0.05:
+            base = rng.choice(rows)
+            title = f"{base['title']} {rng.choice(KO_FILLER if base['source'] == '네이버뉴스' else EN_FILLER)}"
+            snippet = base["snippet"]
+        else:
+            base = None
+        
+        if (base is not None and base["source"] == "네이버뉴스") or (base is None and rng.random() < 0.5):
+            if base is None:
+                title = rng.choice(KO_TEMPLATES).format(company=rng.choice(ko_companies), product=rng.choice(ko_products))
+                title = f"{title} {' '.join(rng.sample(ko_words, 3))}"
+                snippet = " ".join(rng.sample(ko_words, rng.randint(10, 25)) + rng.sample(KO_FILLER, 3))
+            rows.append({
+                "title": title,
+                "link": f"https://n.news.naver.com/mnews/article/{rng.randint(1, 999):03d}/{i:010d}",
+                "snippet": snippet,
+                "date": format_datetime(published.astimezone(kst)),
+                "source": "네이버뉴스",
+                "keyword": keyword,
+                "category": category,
+            })
+        else:
+            if base is None:
+                title = rng.choice(EN_TEMPLATES).format(company=rng.choice(en_companies), product=rng.choice(en_products))
+                title = f"{title} {' '.join(rng.sample(en_words, 3))}"
+            if rng.random() < 0.05:
+                date = rng.choice(RELATIVE_DATES)
+            else:
+                date = format_datetime(published, usegmt=True)
+            rows.append({
+                "title": title,
+                "link": f"https://www.example-news.com/{rng.choice(['business', 'markets', 'energy'])}/{i}",
+                "snippet": "",
+                "date": date,
+                "source": rng.choice(EN_SOURCES),
+                "keyword": keyword,
+                "category": category,
+            })
+    
+    return pd.DataFrame(rows)
+
+
+# 합성 본문 (요약 입력 축약 확인용)
+KO_BOILERPLATE = [
+    "사진=연합뉴스 제공",
+    "홍길동 기자 hong@example.co.kr",
+    "<저작권자(c) 예시뉴스, 무단 전재-재배포 금지>",
+    "관련기사 더보기 | 많이 본 뉴스",
+]
+EN_BOILERPLATE = [
+    "Subscribe to our newsletter for daily market updates.",
+    "Reporting by John Doe; Editing by Jane Roe",
+    "Copyright 2024 Example News. All rights reserved.",
+    "Read more: https://www.example-news.com/markets",
+]
+
+
+def generate_article_bodies(n, seed=42):
+    """
+    (제목, 본문, 제목 키워드) 합성 샘플
+    - 첫 문장: 제목 회사/제품이 등장하는 핵심 문장 (앞에 바이라인)
+    - 이후: 키워드 없는 일반 시황 문장 + 보일러플레이트 줄
+    """
+    rng = random.Random(seed)
+    products = [c for c in KEYWORDS if c in ("PE", "PP", "PO", "POE", "POP", "EVA")] or list(KEYWORDS)
+    companies = [c for c in KEYWORDS if c not in products]
+    ko_products, en_products = split_keywords(products)
+    ko_companies, en_companies = split_keywords(companies)
+    
+    samples = []
+    for i in range(n):
+        korean = i % 2 == 0
+        company = rng.choice(ko_companies if korean else en_companies)
+        product = rng.choice(ko_products if korean else en_products)
+        title = rng.choice(KO_TEMPLATES if korean else EN_TEMPLATES).format(company=company, product=product)
+        filler = KO_FILLER if korean else EN_FILLER
+        
+        if korean:
+            lead = f"(서울=예시뉴스) 홍길동 기자 = {company}이 {product} 사업 계획을 {rng.randint(1, 28)}일 밝혔다."
+            body = [f"{' '.join(rng.sample(filler, 6))} 흐름이 이어지고 있다는 분석이 나온다." for _ in range(rng.randint(15, 30))]
+        else:
+            lead = f"{company} said on Monday its {product} business plan would go ahead as scheduled."
+            body = [f"Analysts said {' '.join(rng.sample(filler, 6))} remained in focus for the region." for _ in range(rng.randint(15, 30))]
+        
+        lines = [lead] + body
+        for line in rng.sample(KO_BOILERPLATE if korean else EN_BOILERPLATE, 2):
+            lines.insert(rng.randint(1, len(lines)), line)
+        samples.append((title, "\n".join(lines), [company, product]))
+    return samples
+
+
+def evaluate_condenser(samples):
+    """
+    요약 입력 축약 전/후 비교 (고정 샘플)
+    - 토큰: 기존 앞 2000자 vs 축약 결과
+    - 키워드 유지율: 제목 회사/제품이 축약 결과에 남은 비율
+    - 보일러플레이트 잔존: 저작권/구독 문구가 남은 샘플 수
+    """
+    tokens_before = tokens_after = kept = total = leftover = 0
+    for title, text, keywords in samples:
+        condensed = condense_text(title, text)
+        tokens_before += count_tokens(text[:2000])
+        tokens_after += count_tokens(condensed)
+        kept += sum(1 for keyword in keywords if keyword in condensed)
+        total += len(keywords)
+        leftover += any(marker in condensed for marker in ("무단 전재", "Copyright", "Subscribe"))
+    
+    return {
+        "samples": len(samples),
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "reduction": round(1 - tokens_after / max(1, tokens_before), 3),
+        "keyword_recall": round(kept / max(1, total), 3),
+        "boilerplate_left": leftover,
+    }
+
+
+# ============================================================
+# 측정
+# ============================================================
+def measure(func, *args, repeat=1):
+    """
+    단계 실행 시간(최소값) + 최대 메모리 측정
+    - 시간: tracemalloc 없이 repeat회 중 최소
+    - 메모리: tracemalloc 1회 실행 (할당 추적 오버헤드로 시간과 분리)
+    - 단계 내부 print는 숨김
+    """
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func(*args)
+            times.append(time.perf_counter() - start)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+    return result, {"seconds": round(min(times), 4), "peak_mb": round(peak / 1024 / 1024, 2)}
+
+
+def table_mb(df):
+    """DataFrame 실제 메모리 (문자열 포함)"""
+    return round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2)
+
+
+def run_end_to_end(raw, days, top_n, threshold):
+    """수집 후 처리 전체 (news.py 저비용 우선 경로)"""
+    df = add_date_columns(raw.copy())
+    df = filter_by_date(df, days)
+    df = compact_articles(aggregate_stories(df))
+    pool = rank_with_candidate_pool(df, top_n, threshold)
+    return rerank(pool, top_n=top_n)
+
+
+def run_pipeline(n, seed=42, repeat=1, days=7):
+    """크기 n 합성 데이터로 단계별 측정 (news.py 순서)"""
+    raw = generate_articles(n, seed, days=days + 3)
+    threshold = SCORE_CONFIG["similarity_threshold"]
+    top_n = SCORE_CONFIG["top_n"]
+    results = {}
+    
+    # add_date_columns는 입력을 수정 → 매 실행 복사본 사용
+    dated, results["parse_dates"] = measure(lambda df: add_date_columns(df.copy()), raw, repeat=repeat)
+    filtered, results["filter_by_date"] = measure(filter_by_date, dated, days, repeat=repeat)
+    stories, results["aggregate_stories"] = measure(aggregate_stories, filtered, repeat=repeat)
+    raw_table_mb = table_mb(stories)
+    stories, results["compact_articles"] = measure(lambda df: compact_articles(df.copy()), stories, repeat=repeat)
+    _, results["match_keywords"] = measure(match_keywords, stories, repeat=repeat)
+    deduped, results["remove_duplicates"] = measure(remove_duplicates_by_similarity, stories, threshold, repeat=repeat)
+    _, results["calculate_strategy_score"] = measure(calculate_strategy_score, deduped, repeat=repeat)
+    pool, results["rank_with_candidate_pool"] = measure(rank_with_candidate_pool, stories, top_n, threshold, repeat=repeat)
+    _, results["rerank"] = measure(rerank, pool, None, None, top_n, repeat=repeat)
+    _, results["end_to_end"] = measure(run_end_to_end, raw, days, top_n, threshold)
+    
+    rows = {
+        "hits": len(raw),
+        "stories": len(stories),
+        "pool": len(pool),
+        "table_mb": raw_table_mb,
+        "compact_table_mb": table_mb(stories),
+    }
+    return {"rows": rows, "stages": results}
+
+
+# ============================================================
+# 기준값 비교
+# ============================================================
+def compare(report, baseline, tolerance):
+    """
+    기준값 대비 느려지거나 메모리 늘어난 단계 목록
+    - tolerance: 허용 비율 (0.2 = 20%)
+    - 아주 짧은 단계(50ms 미만)는 시간 비교 제외 (측정 잡음)
+    """
+    regressions = []
+    for size, result in report["results"].items():
+        base = baseline.get("results", {}).get(size)
+        if base is None:
+            continue
+        
+        for stage, current in result["stages"].items():
+            before = base["stages"].get(stage)
+            if before is None:
+                continue
+            
+            if before["seconds"] >= 0.05 and current["seconds"] > before["seconds"] * (1 + tolerance):
+                regressions.append(f"{size}건 {stage}: 시간 {before['seconds']}s → {current['seconds']}s")
+            if before["peak_mb"] >= 1 and current["peak_mb"] > before["peak_mb"] * (1 + tolerance):
+                regressions.append(f"{size}건 {stage}: 메모리 {before['peak_mb']}MB → {current['peak_mb']}MB")
+    
+    return regressions
+
+
+def print_report(report, baseline=None):
+    for size, result in report["results"].items():
+        rows = result["rows"]
+        print(f"\n📦 {size}건 (기사 {rows['stories']}건, 후보 풀 {rows['pool']}건)")
+        if "table_mb" in rows:
+            print(f"  기사 테이블 {rows['table_mb']:.2f}MB → 압축 {rows['compact_table_mb']:.2f}MB")
+        base = (baseline or {}).get("results", {}).get(size, {}).get("stages", {})
+        
+        for stage, current in result["stages"].items():
+            line = f"  {stage:<26} {current['seconds']:>9.4f}s {current['peak_mb']:>9.2f}MB"
+            if stage in base:
+                before = base[stage]
+                line += f"   (기준 {before['seconds']:.4f}s / {before['peak_mb']:.2f}MB)"
+            print(line)
+    
+    condense = report.get("condense")
+    if condense:
+        print(f"\n✂️ 요약 입력 축약 ({condense['samples']}건, {report['condense_time']['seconds']:.4f}s)")
+        print(f"  입력 토큰 {condense['tokens_before']} → {condense['tokens_after']} (-{condense['reduction']:.0%})")
+        print(f"  제목 키워드 유지 {condense['keyword_recall']:.0%} / 보일러플레이트 잔존 {condense['boilerplate_left']}건")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="뉴스 처리 파이프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="수집 히트 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 (최소값 사용)")
+    parser.add_argument("--days", type=int, default=7, help="검색 기간 (월간 실행: 30)")
+    parser.add_argument("--save", help="결과를 기준값 JSON으로 저장")
+    parser.add_argument("--compare", help="기준값 JSON과 비교")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 저하 비율")
+    args = parser.parse_args(argv)
+    
+    report = {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "seed": args.seed,
+        "days": args.days,
+        "results": {},
+    }
+    
+    for n in args.sizes:
+        print(f"⏱️ {n}건 측정 중...")
+        report["results"][str(n)] = run_pipeline(n, args.seed, args.repeat, args.days)
+    
+    samples = generate_article_bodies(SCORE_CONFIG["top_n"], args.seed)
+    report["condense"], report["condense_time"] = measure(evaluate_condenser, samples, repeat=args.repeat)
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    
+    print_report(report, baseline)
+    
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준값 저장: {args.save}")
+    
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 성능 저하 {len(regressions)}건 (허용 {args.tolerance:.0%})")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n✅ 기준값 대비 성능 저하 없음 (허용 {args.tolerance:.0%})")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
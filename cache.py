@@ -0,0 +1,113 @@
+"""
+디스크 캐시 (SQLite)
+- 키(URL/해시) → 압축 텍스트
+- TTL 만료 + 용량 초과 시 LRU 삭제
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class SqliteCache:
+    """
+    SQLite 기반 영구 캐시 (스레드 안전)
+    - ttl_seconds: 저장 후 만료 시간 (None이면 만료 없음)
+    - max_bytes: 압축 후 총 용량 상한 (초과 시 오래 안 쓴 항목부터 삭제)
+    """
+    
+    def __init__(self, path, ttl_seconds=None, max_bytes=None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at)")
+        self.conn.commit()
+    
+    def get(self, key):
+        """캐시 조회 (없거나 만료되면 None)"""
+        now = time.time()
+        
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.conn.commit()
+                self.misses += 1
+                return None
+            
+            self.conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+        
+        return zlib.decompress(value).decode("utf-8")
+    
+    def set(self, key, value):
+        """캐시 저장 (저장 시각 = 수집 시각)"""
+        blob = zlib.compress(value.encode("utf-8"))
+        now = time.time()
+        
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._evict(now)
+            self.conn.commit()
+    
+    def _evict(self, now):
+        """만료 항목 삭제 → 용량 초과분 LRU 삭제"""
+        if self.ttl_seconds is not None:
+            self.conn.execute("DELETE FROM cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        
+        if self.max_bytes is None:
+            return
+        
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        to_delete = []
+        for key, size in self.conn.execute("SELECT key, size FROM cache ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        
+        self.conn.executemany("DELETE FROM cache WHERE key = ?", to_delete)
+    
+    def stats(self):
+        """히트/미스 통계"""
+        return {"hits": self.hits, "misses": self.misses}
+    
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,249 @@
+"""
+본문 축약 (요약 입력 전처리)
+- 보일러플레이트(저작권/기자/구독 안내 등) 제거
+- 문장별 점수: 제목 + 등장 키워드와의 TF-IDF 유사도 + 제목 키워드 포함 + 문장 중심성 + 앞 문장 가산
+- 토큰 예산 안에서 높은 점수 문장 선택 (원래 순서 유지)
+- 토큰 수: tiktoken 있으면 사용, 없으면 문자 기반 추정
+"""
+
+import re
+import threading
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from config import KEYWORDS, SUMMARY_CONFIG
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# ============================================================
+# 토큰 수
+# ============================================================
+# 토크나이저 로드 실패 표시 (재시도 안 함)
+_UNAVAILABLE = object()
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def get_encoding():
+    """
+    모델 토크나이저 (최초 1회 로드)
+    - tiktoken 미설치 또는 BPE 파일 다운로드 실패(오프라인) 시 None → 문자 기반 추정
+    """
+    global _encoding
+    
+    with _encoding_lock:
+        if _encoding is None:
+            _encoding = load_encoding()
+    return None if _encoding is _UNAVAILABLE else _encoding
+
+
+def load_encoding():
+    """모델 토크나이저 → 없으면 o200k_base → 실패 시 _UNAVAILABLE"""
+    if tiktoken is None:
+        return _UNAVAILABLE
+    
+    try:
+        return tiktoken.encoding_for_model(SUMMARY_CONFIG["model"])
+    except Exception:
+        pass
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"⚠️ 토크나이저 로드 실패 (문자 기반 추정 사용): {str(e)[:50]}")
+        return _UNAVAILABLE
+
+
+def count_tokens(text):
+    """
+    토큰 수
+    - tiktoken: 실제 토크나이저
+    - 추정: 영문/숫자 약 4자당 1토큰, 한글 등 비ASCII 약 1자당 1토큰
+    """
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def truncate_tokens(text, budget):
+    """앞에서부터 budget 토큰까지 자르기"""
+    encoding = get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+    
+    used = 0.0
+    for i, ch in enumerate(text):
+        used += 0.25 if ord(ch) < 128 else 1.0
+        if used > budget:
+            return text[:i]
+    return text
+
+
+# ============================================================
+# 보일러플레이트 제거 / 문장 분리
+# ============================================================
+# 보일러플레이트 줄: 짧은 줄만 대상 (본문 문단은 한 줄이 길어 제외)
+BOILERPLATE_MAX_CHARS = 120
+
+# 어디에 있어도 보일러플레이트인 문구
+BOILERPLATE_PATTERNS = [
+    r"무단\s*전재", r"재배포\s*금지", r"저작권자\s*[(ⓒ©]", r"ⓒ|©", r"all rights reserved",
+]
+# 줄 첫머리에 올 때만 보일러플레이트 (본문에도 쓰이는 단어: 구독, 쿠키, 광고 등)
+BOILERPLATE_START_PATTERNS = [
+    # 국문
+    r"사진\s*=", r"\[사진\]", r"구독(하기|\s*신청)", r"기자\s*구독", r"제보하기", r"카카오톡\s*(채널|친구)",
+    r"관련\s*기사", r"많이\s*본\s*뉴스",
+    # 영문
+    r"copyright\s*(\(c\)|ⓒ|©|\d{4})", r"subscribe\b", r"sign up\b", r"newsletter\b", r"click here\b",
+    r"read more\b", r"advertisement\W*$", r"cookies?\s*(policy|settings)", r"terms of (use|service)\b",
+    r"privacy policy\b",
+    r"follow us\b", r"share this\b", r"reporting by\b", r"editing by\b",
+]
+BOILERPLATE_RE = re.compile("|".join(BOILERPLATE_PATTERNS), re.IGNORECASE)
+BOILERPLATE_START_RE = re.compile(r"^\W*(" + "|".join(BOILERPLATE_START_PATTERNS) + ")", re.IGNORECASE)
+# 기사 첫머리 바이라인 "(서울=연합뉴스) 홍길동 기자 =" → 제거 후 본문 유지
+BYLINE_RE = re.compile(r"^\s*(\([^)]*=[^)]*\)\s*)?([가-힣]{2,4}\s*(기자|특파원)\s*=\s*)?")
+URL_RE = re.compile(r"https?://\S+|www\.\S+|[\w.+-]+@[\w-]+\.[\w.]+")
+SENTENCE_RE = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+# 너무 짧은 문장 (메뉴/캡션 등)
+MIN_SENTENCE_CHARS = 15
+
+
+def is_boilerplate(line):
+    """짧은 줄 중 저작권/구독/사진 캡션 등 안내 문구"""
+    if len(line) > BOILERPLATE_MAX_CHARS:
+        return False
+    return bool(BOILERPLATE_RE.search(line) or BOILERPLATE_START_RE.match(line))
+
+
+def remove_boilerplate(text):
+    """줄 단위 보일러플레이트 제거 + URL/이메일 삭제"""
+    lines = []
+    for line in str(text).splitlines():
+        line = BYLINE_RE.sub("", URL_RE.sub("", line)).strip()
+        if line and not is_boilerplate(line):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def split_sentences(text):
+    """문장 분리 (짧은 조각 제외, 중복 문장 제거)"""
+    sentences = []
+    for sentence in SENTENCE_RE.split(text):
+        sentence = sentence.strip()
+        if len(sentence) >= MIN_SENTENCE_CHARS and not is_boilerplate(sentence):
+            sentences.append(sentence)
+    return list(dict.fromkeys(sentences))
+
+
+# ============================================================
+# 문장 점수 / 선택
+# ============================================================
+ALL_KEYWORDS = sorted({keyword for keywords in KEYWORDS.values() for keyword in keywords}, key=len, reverse=True)
+
+# 문장 점수 가중치
+QUERY_WEIGHT = 0.4
+KEYWORD_WEIGHT = 0.2
+CENTRALITY_WEIGHT = 0.3
+LEAD_WEIGHT = 0.1
+
+# 문장 수 상한 (긴 본문 뒷부분은 후보 제외)
+MAX_SENTENCES = 80
+
+
+def matched_keywords(text):
+    """본문/제목에 등장한 config 키워드"""
+    lowered = text.lower()
+    return [keyword for keyword in ALL_KEYWORDS if keyword.lower() in lowered]
+
+
+def score_sentences(title, sentences):
+    """
+    문장 점수
+    - 질의(제목 + 등장 키워드)와의 유사도
+    - 제목 키워드 포함 비율
+    - 중심성 (다른 문장과의 평균 유사도)
+    - 앞 문장 가산 (리드 문단)
+    - 한글 형태소 분석 없이 문자 n-gram TF-IDF
+    """
+    query = " ".join([str(title)] + matched_keywords(f"{title} {' '.join(sentences)}"))
+    title_keywords = [keyword.lower() for keyword in matched_keywords(str(title))]
+    if title_keywords:
+        keyword_hits = np.array([
+            sum(keyword in sentence.lower() for keyword in title_keywords) for sentence in sentences
+        ]) / len(title_keywords)
+    else:
+        keyword_hits = np.zeros(len(sentences))
+    
+    try:
+        vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 3), sublinear_tf=True)
+        matrix = vectorizer.fit_transform(sentences + [query])
+    except ValueError:
+        return np.zeros(len(sentences))
+    
+    sentence_matrix = matrix[:-1]
+    query_sim = (sentence_matrix @ matrix[-1].T).toarray().ravel()
+    
+    similarity = (sentence_matrix @ sentence_matrix.T).toarray()
+    np.fill_diagonal(similarity, 0.0)
+    centrality = similarity.sum(axis=1) / max(1, len(sentences) - 1)
+    
+    lead = 1.0 / (1.0 + np.arange(len(sentences)))
+    return (
+        QUERY_WEIGHT * query_sim
+        + KEYWORD_WEIGHT * keyword_hits
+        + CENTRALITY_WEIGHT * centrality
+        + LEAD_WEIGHT * lead
+    )
+
+
+def select_sentences(title, text, budget, max_sentences=None):
+    """
+    점수 높은 문장부터 예산/개수 안에서 선택 → 원래 순서로 반환
+    - budget: 토큰 예산 (None이면 제한 없음)
+    """
+    sentences = split_sentences(remove_boilerplate(text))[:MAX_SENTENCES]
+    if not sentences:
+        return []
+    
+    scores = score_sentences(title, sentences)
+    chosen = []
+    used = 0
+    for i in np.argsort(-scores, kind="stable"):
+        tokens = count_tokens(sentences[i])
+        if budget is not None and used + tokens > budget:
+            continue
+        chosen.append(i)
+        used += tokens
+        if max_sentences is not None and len(chosen) >= max_sentences:
+            break
+    
+    return [sentences[i] for i in sorted(chosen)]
+
+
+def condense_text(title, text, budget=None):
+    """
+    요약 입력 축약
+    - 보일러플레이트 제거 후 예산 이내면 그대로
+    - 초과하면 점수 높은 문장으로 예산 채우기
+    """
+    if budget is None:
+        budget = SUMMARY_CONFIG.get("input_token_budget", 300)
+    
+    cleaned = remove_boilerplate(text)
+    if count_tokens(cleaned) <= budget:
+        return " ".join(cleaned.split())
+    
+    selected = select_sentences(title, cleaned, budget)
+    if selected:
+        return " ".join(selected)
+    
+    # 문장 분리가 안 되는 텍스트는 앞부분만
+    return truncate_tokens(cleaned, budget)
@@ -163,7 +163,72 @@ KEYWORD_MAPPING = {
 CRAWL_CONFIG = {
     "naver_display": 20,
     "google_num": 20,
-    "delay": 0.5,
+    "delay": 0.5,                 # 순차 모드에서만 사용
+    
+    # 동시 크롤링
+    "concurrent": True,
+    "max_workers": 8,
+    
+    # 소스별 속도 제한 (토큰 버킷: 초당 요청 수, 최대 버스트)
+    "rate_limits": {
+        "naver": {"rate": 8.0, "burst": 4},
+        "google": {"rate": 4.0, "burst": 2},
+        "google_redirect": {"rate": 8.0, "burst": 4},
+    },
+    
+    # 구글 뉴스 리다이렉트 링크 → 원문 URL (중복 제거/본문 수집 기준)
+    "resolve_canonical": True,
+    
+    # 동의어 OR 배치 (카테고리별 영문 키워드를 한 쿼리로)
+    "batch_synonyms": True,
+    "google_batch_max_chars": 120,  # OR 쿼리 길이 상한
+    
+    # 구글 RSS: 기간 이전 기사를 만나면 즉시 중단
+    # (검색 RSS는 관련도순이라 기본은 건너뛰기만 함)
+    "google_stop_at_cutoff": False,
+    
+    # 증분 크롤링 (키워드/소스별 워터마크)
+    "incremental": False,
+    "state_path": "./cache/crawl_state.json",
+    "state_max_seen": 300,        # 키워드별 보관 링크 수
+    "naver_max_pages": 5,         # 증분 모드 페이지 상한
+    
+    # 기간 기반 쿼리 계획 (기간이 길수록 요청량 확대)
+    "google_num_max": 100,        # 구글 RSS 최대 결과 수
+    "window_max_pages": 10,       # 네이버 기간 페이지 상한
+    
+    # HTTP 세션 (커넥션 풀 공유)
+    "http_pool_connections": 32,  # 호스트별 풀 보관 개수
+    "http_pool_maxsize": 8,       # 호스트당 유지 커넥션 수
+    "http_timeout": (5, 15),      # (연결, 읽기) 기본 타임아웃 (초)
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    
+    # 본문 수집 (도메인별 예의 준수)
+    "fulltext_workers": 8,
+    "fulltext_per_domain": 2,     # 도메인별 동시 접속 수
+    "fulltext_domain_delay": 1.0, # 같은 도메인 요청 간 최소 간격 (초)
+    "fulltext_timeout": 10,       # 기사 1건 요청 타임아웃 (초)
+    "fulltext_batch_timeout": 120,  # 전체 배치 최대 대기 (초)
+}
+
+# ============================================================
+# 💾 캐시 설정
+# ============================================================
+CACHE_CONFIG = {
+    "dir": "./cache",
+    
+    # 기사 본문
+    "article_ttl_days": 7,
+    "article_max_mb": 200,
+    
+    # 리다이렉트 → 정규 URL
+    "redirect_ttl_days": 30,
+    "redirect_max_mb": 20,
+    "redirect_unresolved_ttl_hours": 24,  # 구글 뉴스를 벗어나지 못한 링크 (재시도 간격)
+    
+    # 요약 (제목/내용/모델/프롬프트 해시 키)
+    "summary_ttl_days": 30,
+    "summary_max_mb": 50,
 }
 
 # ============================================================
@@ -195,6 +260,49 @@ SCORE_CONFIG = {
     
     # 중복 제거
     "similarity_threshold": 0.4,
+    "similarity_block_size": 1024,    # 유사도 블록 크기 (메모리 상한)
+}
+
+# ============================================================
+# ⚡ 파이프라인 설정
+# ============================================================
+PIPELINE_CONFIG = {
+    # 저비용 우선: 점수로 후보를 먼저 좁힌 뒤 중복 제거
+    "cheap_first": True,
+    "candidate_pool_factor": 4,     # 후보 풀 = top_n × factor
+    
+    # 스트리밍: 수집 중에 잠정 Top N 본문 선행 (최종 결과는 배치 모드와 동일)
+    "streaming": True,
+    "queue_size": 4,                # 수집 → 처리 배치 큐 크기 (가득 차면 수집 대기)
+    "prefetch_workers": 4,          # 선행 본문 수집 스레드 수
+    
+    # 재정렬: 점수 후보 테이블 저장 위치 (가중치 변경 시 재수집 없이 재계산)
+    "score_table_path": "./cache/score_table.pkl",
+}
+
+# ============================================================
+# 🗂️ 보고 이력 (이미 보고한 기사 제외)
+# ============================================================
+HISTORY_CONFIG = {
+    "enabled": True,
+    "path": "./cache/story_index.npz",  # 범위별 파일: story_index_{범위}.npz
+    "days": 14,               # 이력 보관 기간
+    # 검색 기간 → 이력 범위 (같은 범위끼리만 비교, 없는 기간/직접 지정은 적용 안 함)
+    "scopes": {
+        "전일": "daily",
+        "이번주": "weekly",
+        "최근 일주일": "weekly",
+        "전주": "weekly",
+        "최근 30일": "monthly",
+        "이번달": "monthly",
+        "지난달": "monthly",
+    },
+    "scope_days": {"weekly": 28, "monthly": 62},  # 범위별 보관 기간 (없으면 days)
+    "mode": "drop",           # "drop": 제외 / "flag": 후속 기사 표시
+    "threshold": 0.6,         # 추정 Jaccard 유사도
+    "min_age_hours": 12,      # 최근 보고분은 비교 제외 (같은 날 재실행 대비)
+    "num_perm": 64,
+    "bands": 16,
 }
 
 # 소스별 신뢰도 점수
@@ -221,6 +329,30 @@ SUMMARY_CONFIG = {
     "max_tokens": 100,
     "system_prompt": """석유화학/폴리머 산업 전문가로서 뉴스를 2-3문장으로 한글 요약하세요.
 핵심 내용과 시장 영향을 간결하게 작성하세요.""",
+
+    # 요약 방식: "llm"(GPT) / "extractive"(본문 문장 추출, 네트워크 없음)
+    # llm 모드도 실패/마감 초과 기사, API 키 없음/AI 요약 제외 시 추출 요약 사용
+    "mode": "llm",
+    "extractive_sentences": 3,
+    "extractive_token_budget": 200, # 추출 요약 길이 상한 (토큰)
+    "deadline": 90,                 # LLM 요약 전체 마감 (초, None이면 제한 없음)
+    
+    # 입력 축약: 보일러플레이트 제거 + 핵심 문장 선택 (False면 앞 2000자)
+    "reduce_input": True,
+    "input_token_budget": 300,      # 기사당 입력 토큰 예산
+    
+    # 비동기 요약 엔진
+    "base_url": None,               # 호환 서버/로컬 스텁 주소 (None이면 OpenAI)
+    "max_concurrency": 8,           # 동시 요청 수
+    "rpm": 500,                     # 분당 요청 수 상한
+    "tpm": 200000,                  # 분당 토큰 수 상한 (입력 추정 + max_tokens)
+    "timeout": 30,                  # 요청별 타임아웃 (초)
+    "max_retries": 2,
+    
+    # 배치 요약: 여러 기사를 요청 1회로 (JSON 배열 응답, 실패 시 분할 재시도 → 단건)
+    "batch_mode": True,
+    "batch_max_articles": 8,
+    "batch_token_budget": 6000,     # 배치 입력 토큰 추정 상한
 }
 
 # ============================================================
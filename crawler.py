@@ -6,119 +6,543 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import threading
 import pandas as pd
 import urllib.parse
 import xml.etree.ElementTree as ET
 import re
-from datetime import datetime, timedelta
+import os
+import math
+import json
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, timedelta, timezone
 from newspaper import Article
-from config import CRAWL_CONFIG
+from config import CRAWL_CONFIG, CACHE_CONFIG
+from cache import SqliteCache
 
 def is_korean(text):
     """한글 포함 여부 확인"""
     return bool(re.search('[가-힣]', text))
 
 
-def crawl_naver(keyword, client_id, client_secret, display=20):
+# ============================================================
+# HTTP 세션 (keep-alive 커넥션 풀 공유)
+# ============================================================
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    커넥션 풀 어댑터
+    - 풀이 밀려나도 연결/요청 수를 누적 보관 (재사용 통계용)
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self.retired_connections = 0
+        self.retired_requests = 0
+        super().__init__(*args, **kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pools.dispose_func = self._dispose_pool
+    
+    def _dispose_pool(self, pool):
+        self.retired_connections += pool.num_connections
+        self.retired_requests += pool.num_requests
+        pool.close()
+    
+    def stats(self):
+        """(열린 커넥션 수, 총 요청 수)"""
+        opened = self.retired_connections
+        requested = self.retired_requests
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            opened += pool.num_connections
+            requested += pool.num_requests
+        return opened, requested
+
+
+_http_session = None
+_http_adapter = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """공유 HTTP 세션 (최초 1회 생성)"""
+    global _http_session, _http_adapter
+    
+    with _http_session_lock:
+        if _http_session is None:
+            adapter = PooledHTTPAdapter(
+                pool_connections=CRAWL_CONFIG.get("http_pool_connections", 32),
+                pool_maxsize=CRAWL_CONFIG.get("http_pool_maxsize", 8),
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": CRAWL_CONFIG.get("user_agent", "Mozilla/5.0"),
+                "Accept-Encoding": "gzip, deflate",
+            })
+            _http_session = session
+            _http_adapter = adapter
+        return _http_session
+
+
+def http_get(url, **kwargs):
+    """공유 세션 GET (기본 타임아웃 적용)"""
+    kwargs.setdefault("timeout", CRAWL_CONFIG.get("http_timeout", (5, 15)))
+    return get_http_session().get(url, **kwargs)
+
+
+def get_http_stats():
+    """
+    커넥션 재사용 통계
+    - opened: 새로 연 커넥션 수
+    - reused: 기존 커넥션으로 처리한 요청 수
+    """
+    if _http_adapter is None:
+        return {"opened": 0, "reused": 0, "requests": 0}
+    
+    opened, requested = _http_adapter.stats()
+    return {"opened": opened, "reused": max(0, requested - opened), "requests": requested}
+
+
+def download_html(url, timeout=None):
+    """
+    기사 HTML 다운로드 (공유 세션)
+    - charset 헤더가 없으면 bytes 반환 → newspaper가 인코딩 판별
+    """
+    response = http_get(url, timeout=timeout or CRAWL_CONFIG.get("http_timeout", (5, 15)))
+    response.raise_for_status()
+    
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        return response.text
+    return response.content
+
+
+# ============================================================
+# 속도 제한 (소스별 토큰 버킷)
+# ============================================================
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한기 (스레드 안전)
+    - rate: 초당 보충 토큰 수
+    - burst: 최대 적립 토큰 수
+    """
+    
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, tokens=1.0):
+        """토큰이 생길 때까지 대기 후 차감"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class DomainThrottle:
+    """
+    도메인별 접속 제한기 (스레드 안전)
+    - max_concurrent: 도메인별 동시 요청 수
+    - min_delay: 같은 도메인 요청 시작 간 최소 간격 (초)
+    """
+    
+    def __init__(self, max_concurrent=2, min_delay=1.0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_delay = min_delay
+        self.semaphores = {}
+        self.next_start = {}
+        self.lock = threading.Lock()
+    
+    @contextmanager
+    def slot(self, url):
+        """해당 URL 도메인의 슬롯 확보 (with 블록 동안 유지)"""
+        domain = urllib.parse.urlparse(url).netloc.lower()
+        
+        with self.lock:
+            if domain not in self.semaphores:
+                self.semaphores[domain] = threading.Semaphore(self.max_concurrent)
+            semaphore = self.semaphores[domain]
+        
+        semaphore.acquire()
+        try:
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, self.next_start.get(domain, now))
+                self.next_start[domain] = start + self.min_delay
+            
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            semaphore.release()
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(source):
+    """소스별 속도 제한기 (CRAWL_CONFIG["rate_limits"] 기준, 최초 1회 생성)"""
+    with _rate_limiters_lock:
+        if source not in _rate_limiters:
+            limit = CRAWL_CONFIG.get("rate_limits", {}).get(source, {})
+            _rate_limiters[source] = TokenBucket(limit.get("rate", 2.0), limit.get("burst", 1))
+        return _rate_limiters[source]
+
+
+def crawl_naver(keyword, client_id, client_secret, display=20, since=None, seen=None, max_pages=1, status=None):
     """
     네이버 뉴스 API 검색
+    - 날짜순 결과를 start로 페이지 이동
+    - since(기준 시각) 이전 기사 또는 이미 본 링크에 도달하면 중단
+    - status: {"complete": 기준 시각/결과 끝까지 오류 없이 수집했는지} (페이지 상한/실패 시 False)
     """
     url = "https://openapi.naver.com/v1/search/news.json"
     headers = {
         "X-Naver-Client-Id": client_id,
         "X-Naver-Client-Secret": client_secret,
     }
-    params = {
-        "query": keyword,
-        "display": display,
-        "sort": "date",
-    }
+    seen = seen or set()
+    
+    articles = []
+    start = 1
+    complete = False
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        articles = []
-        for item in data.get("items", []):
-            # HTML 태그 제거
-            title = re.sub(r'<[^>]+>', '', item.get("title", ""))
-            snippet = re.sub(r'<[^>]+>', '', item.get("description", ""))
+        for _ in range(max(1, max_pages)):
+            params = {
+                "query": keyword,
+                "display": display,
+                "start": start,
+                "sort": "date",
+            }
             
-            articles.append({
-                "title": title,
-                "link": item.get("originallink") or item.get("link", ""),
-                "snippet": snippet,
-                "date": item.get("pubDate", ""),
-                "source": "네이버뉴스",
-                "keyword": keyword,
-            })
-        
-        return articles
+            get_rate_limiter("naver").acquire()
+            response = http_get(url, headers=headers, params=params)
+            response.raise_for_status()
+            data = response.json()
+            items = data.get("items", [])
+            
+            reached = False
+            for item in items:
+                link = item.get("originallink") or item.get("link", "")
+                published = to_utc(parse_date(item.get("pubDate", "")))
+                
+                # 워터마크 도달 (날짜순이므로 이후는 모두 과거)
+                if link in seen or (since is not None and published is not None and published < since):
+                    reached = True
+                    break
+                
+                # HTML 태그 제거
+                title = re.sub(r'<[^>]+>', '', item.get("title", ""))
+                snippet = re.sub(r'<[^>]+>', '', item.get("description", ""))
+                
+                articles.append({
+                    "title": title,
+                    "link": link,
+                    "snippet": snippet,
+                    "date": item.get("pubDate", ""),
+                    "source": "네이버뉴스",
+                    "keyword": keyword,
+                })
+            
+            start += display
+            if reached or len(items) < display:
+                complete = True
+                break
+            if start > 1000:
+                break
         
     except Exception as e:
         print(f"❌ 네이버 검색 실패 [{keyword}]: {e}")
-        return []
+    
+    if status is not None:
+        status["complete"] = complete
+    return articles
 
 
-def crawl_google_rss(keyword, num=20, lang="en"):
+def crawl_google_rss(keyword, num=20, lang="en", since=None, seen=None, cutoff=None, operator="", status=None):
     """
     Google News RSS 검색 (무료 무제한)
+    - 응답 스트림을 iterparse로 읽으며 item 단위 처리 후 해제
+    - 기간 내 기사 num건이 모이면 즉시 중단
+    - since(워터마크)/cutoff(기간) 이전 기사와 이미 본 링크는 제외
+    - operator: 기간 검색 연산자 (예: "when:1d", "after:2025-01-01")
+    - status: {"complete": 피드 끝/기간 시작까지 오류 없이 읽었는지} (num건 상한/실패 시 False)
     """
-    encoded_keyword = urllib.parse.quote(keyword)
+    query = f"{keyword} {operator}".strip()
+    encoded_keyword = urllib.parse.quote(query)
+    seen = seen or set()
+    stop_at_cutoff = CRAWL_CONFIG.get("google_stop_at_cutoff", False)
     
     if lang == "ko":
         url = f"https://news.google.com/rss/search?q={encoded_keyword}&hl=ko&gl=KR&ceid=KR:ko"
     else:
         url = f"https://news.google.com/rss/search?q={encoded_keyword}&hl=en&gl=US&ceid=US:en"
     
+    articles = []
+    complete = False
+    
     try:
-        response = requests.get(url, timeout=10)
+        get_rate_limiter("google").acquire()
+        response = http_get(url, stream=True)
         response.raise_for_status()
+        response.raw.decode_content = True
         
-        root = ET.fromstring(response.content)
-        articles = []
-        
-        for item in root.findall(".//item")[:num]:
-            title = item.findtext("title", "")
-            link = item.findtext("link", "")
-            pub_date = item.findtext("pubDate", "")
-            
-            # 소스 추출 (제목에서 " - 소스명" 패턴)
-            source = "Google News"
-            if " - " in title:
-                parts = title.rsplit(" - ", 1)
-                title = parts[0]
-                source = parts[1] if len(parts) > 1 else "Google News"
-            
-            articles.append({
-                "title": title,
-                "link": link,
-                "snippet": "",  # RSS는 snippet 없음
-                "date": pub_date,
-                "source": source,
-                "keyword": keyword,
-            })
-        
-        return articles
+        try:
+            channel = None
+            for event, elem in ET.iterparse(response.raw, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == "channel":
+                        channel = elem
+                    continue
+                
+                if elem.tag != "item":
+                    continue
+                
+                title = elem.findtext("title", "")
+                link = elem.findtext("link", "")
+                pub_date = elem.findtext("pubDate", "")
+                
+                # 처리한 item 해제
+                elem.clear()
+                if channel is not None:
+                    channel.remove(elem)
+                
+                published = to_utc(parse_date(pub_date))
+                if cutoff is not None and published is not None and published < cutoff:
+                    if stop_at_cutoff:
+                        complete = True
+                        break
+                    continue
+                
+                if link in seen:
+                    continue
+                if since is not None and published is not None and published < since:
+                    continue
+                
+                # 소스 추출 (제목에서 " - 소스명" 패턴)
+                source = "Google News"
+                if " - " in title:
+                    parts = title.rsplit(" - ", 1)
+                    title = parts[0]
+                    source = parts[1] if len(parts) > 1 else "Google News"
+                
+                articles.append({
+                    "title": title,
+                    "link": link,
+                    "snippet": "",  # RSS는 snippet 없음
+                    "date": pub_date,
+                    "source": source,
+                    "keyword": keyword,
+                })
+                
+                if len(articles) >= num:
+                    break
+            else:
+                complete = True
+        finally:
+            response.close()
         
     except Exception as e:
         print(f"❌ 구글 RSS 검색 실패 [{keyword}]: {e}")
-        return []
+    
+    if status is not None:
+        status["complete"] = complete
+    return articles
+
 
+_article_cache = None
+_article_cache_lock = threading.Lock()
 
-def fetch_full_article(url):
+
+def get_article_cache():
+    """기사 본문 디스크 캐시 (URL 키, 최초 1회 생성)"""
+    global _article_cache
+    
+    with _article_cache_lock:
+        if _article_cache is None:
+            _article_cache = SqliteCache(
+                os.path.join(CACHE_CONFIG.get("dir", "./cache"), "articles.db"),
+                ttl_seconds=CACHE_CONFIG.get("article_ttl_days", 7) * 86400,
+                max_bytes=CACHE_CONFIG.get("article_max_mb", 200) * 1024 * 1024,
+            )
+        return _article_cache
+
+
+# ============================================================
+# 정규 URL (구글 뉴스 리다이렉트 해석)
+# ============================================================
+_redirect_cache = None
+_unresolved_cache = None
+_redirect_cache_lock = threading.Lock()
+
+TRACKING_PARAMS = {"fbclid", "gclid"}
+
+
+def get_redirect_cache():
+    """리다이렉트 → 정규 URL 디스크 캐시 (최초 1회 생성)"""
+    global _redirect_cache
+    
+    with _redirect_cache_lock:
+        if _redirect_cache is None:
+            _redirect_cache = SqliteCache(
+                os.path.join(CACHE_CONFIG.get("dir", "./cache"), "redirects.db"),
+                ttl_seconds=CACHE_CONFIG.get("redirect_ttl_days", 30) * 86400,
+                max_bytes=CACHE_CONFIG.get("redirect_max_mb", 20) * 1024 * 1024,
+            )
+        return _redirect_cache
+
+
+def get_unresolved_cache():
+    """
+    원문으로 리다이렉트되지 않은 구글 뉴스 링크 (짧은 TTL 부정 캐시)
+    - JS 중간 페이지 등: 매 실행 같은 GET 반복 방지
+    """
+    global _unresolved_cache
+    
+    with _redirect_cache_lock:
+        if _unresolved_cache is None:
+            _unresolved_cache = SqliteCache(
+                os.path.join(CACHE_CONFIG.get("dir", "./cache"), "redirects_unresolved.db"),
+                ttl_seconds=CACHE_CONFIG.get("redirect_unresolved_ttl_hours", 24) * 3600,
+                max_bytes=CACHE_CONFIG.get("redirect_max_mb", 20) * 1024 * 1024,
+            )
+        return _unresolved_cache
+
+
+def normalize_url(url):
+    """URL 정규화 (호스트 소문자, 추적 파라미터/프래그먼트 제거)"""
+    if not url:
+        return url
+    
+    parts = urllib.parse.urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    return urllib.parse.urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path,
+        urllib.parse.urlencode(query),
+        "",
+    ))
+
+
+def is_google_news_url(url):
+    return urllib.parse.urlsplit(url or "").netloc.lower() == "news.google.com"
+
+
+def resolve_canonical_url(url):
+    """
+    구글 뉴스 리다이렉트 링크 → 원문 URL
+    - 캐시 우선, 실패 시 원래 링크 유지
+    - 오류 응답(429/503 등)은 캐시하지 않음 (다음 실행에서 재시도)
+    - 구글 뉴스를 벗어나지 못한 링크는 부정 캐시 (redirect_unresolved_ttl_hours 동안 재요청 안 함)
+    """
+    if not is_google_news_url(url):
+        return normalize_url(url)
+    
+    cache = get_redirect_cache()
+    cached = cache.get(url)
+    if cached is not None:
+        return cached
+    if get_unresolved_cache().get(url) is not None:
+        return url
+    
+    try:
+        get_rate_limiter("google_redirect").acquire()
+        response = http_get(url, allow_redirects=True, stream=True)
+        try:
+            response.raise_for_status()
+            final_url = response.url
+        finally:
+            response.close()
+    except Exception:
+        return url
+    
+    if is_google_news_url(final_url):
+        get_unresolved_cache().set(url, "1")
+        return url
+    
+    canonical = normalize_url(final_url)
+    cache.set(url, canonical)
+    return canonical
+
+
+def resolve_canonical_links(links, known=None):
+    """
+    링크 목록 정규 URL 해석 (고유 링크만 병렬 처리)
+    - known: 이미 해석한 {원래 링크: 정규 URL} (스트리밍 단계 결과 재사용)
+    - 반환: {원래 링크: 정규 URL}
+    """
+    known = known or {}
+    unique_links = list(dict.fromkeys(links))
+    pending = [link for link in unique_links if link not in known]
+    get_redirect_cache().reset_stats()
+    max_workers = max(1, CRAWL_CONFIG.get("max_workers", 8))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resolved = dict(zip(pending, executor.map(resolve_canonical_url, pending)))
+    resolved = {link: known[link] if link in known else resolved[link] for link in unique_links}
+    
+    changed = sum(1 for link in unique_links if is_google_news_url(link) and not is_google_news_url(resolved[link]))
+    stats = get_redirect_cache().stats()
+    reused = len(unique_links) - len(pending)
+    print(f"🔗 정규 URL 해석: {changed}건 (재사용 {reused} / 캐시 히트 {stats['hits']} / 미스 {stats['misses']})")
+    return resolved
+
+
+def download_full_article(url, timeout=None):
     """
-    Newspaper3k로 기사 본문 크롤링
+    Newspaper3k로 기사 본문 크롤링 (캐시 미사용)
+    - 성공한 본문만 캐시에 저장
     """
+    if timeout is None:
+        timeout = CRAWL_CONFIG.get("fulltext_timeout", 10)
+    
     try:
         article = Article(url)
-        article.download()
+        article.download(input_html=download_html(url, timeout))
         article.parse()
-        return article.text[:3000]  # 최대 3000자
+        text = article.text[:3000]  # 최대 3000자
     except Exception as e:
         return ""
+    
+    if text:
+        get_article_cache().set(url, text)
+    return text
+
+
+def fetch_full_article(url, timeout=None):
+    """
+    기사 본문 조회 (캐시 → 네트워크)
+    """
+    cached = get_article_cache().get(url)
+    if cached is not None:
+        return cached
+    return download_full_article(url, timeout)
 
 
 def parse_date(date_str):
@@ -180,29 +604,115 @@ def parse_date(date_str):
     return None
 
 
+def to_utc(parsed):
+    """datetime → UTC aware (naive는 로컬 시각으로 간주)"""
+    if parsed is None:
+        return None
+    return parsed.astimezone(timezone.utc)
+
+
+# ============================================================
+# 증분 크롤링 상태 (키워드/소스별 워터마크)
+# ============================================================
+def load_crawl_state(path=None):
+    """
+    크롤링 상태 로드
+    {"naver|폴리에틸렌": {"newest": ISO 시각, "seen": [링크, ...]}, ...}
+    """
+    path = path or CRAWL_CONFIG.get("state_path", "./cache/crawl_state.json")
+    if not os.path.exists(path):
+        return {}
+    
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ 크롤링 상태 로드 실패: {e}")
+        return {}
+
+
+def save_crawl_state(state, path=None):
+    """크롤링 상태 저장 (임시 파일 → 교체)"""
+    path = path or CRAWL_CONFIG.get("state_path", "./cache/crawl_state.json")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def get_watermark(state, source, keyword):
+    """(기준 시각, 이미 본 링크 set) 반환"""
+    entry = state.get(f"{source}|{keyword}")
+    if not entry:
+        return None, set()
+    
+    newest = datetime.fromisoformat(entry["newest"]) if entry.get("newest") else None
+    return newest, set(entry.get("seen", []))
+
+
+def update_watermark(state, source, keyword, articles):
+    """수집 결과로 최신 발행 시각/본 링크 갱신"""
+    key = f"{source}|{keyword}"
+    entry = state.get(key, {})
+    
+    newest = datetime.fromisoformat(entry["newest"]) if entry.get("newest") else None
+    for article in articles:
+        published = to_utc(parse_date(article.get("date", "")))
+        if published is not None and (newest is None or published > newest):
+            newest = published
+    
+    max_seen = CRAWL_CONFIG.get("state_max_seen", 300)
+    seen = [a["link"] for a in articles if a.get("link")] + entry.get("seen", [])
+    seen = list(dict.fromkeys(seen))[:max_seen]
+    
+    state[key] = {
+        "newest": newest.isoformat() if newest else None,
+        "seen": seen,
+    }
+
+
+def parse_dates(dates):
+    """
+    날짜 문자열 Series → UTC datetime64 Series
+    - 고유 문자열만 1회씩 파싱 후 매핑 (중복 파싱 없음)
+    """
+    dates = dates.fillna("").astype(str)
+    parsed = {value: to_utc(parse_date(value)) for value in dates.unique()}
+    return pd.to_datetime(dates.map(parsed), utc=True)
+
+
+def add_date_columns(df, now=None):
+    """
+    수집 직후 날짜 정규화
+    - published_at: 발행 시각 (UTC datetime64)
+    - age_hours: 현재 기준 경과 시간
+    """
+    if now is None:
+        now = pd.Timestamp.now(tz="UTC")
+    
+    df["published_at"] = parse_dates(df["date"]) if not df.empty else pd.Series(dtype="datetime64[ns, UTC]")
+    df["age_hours"] = (now - df["published_at"]).dt.total_seconds() / 3600
+    return df
+
+
 def filter_by_date(df, days_ago):
     """
-    날짜 기준 필터링
+    날짜 기준 필터링 (published_at 기준)
     """
     if df.empty:
         return df
     
-    df = df.copy()
-    cutoff_date = datetime.now() - timedelta(days=days_ago)
+    if "published_at" not in df.columns:
+        df = add_date_columns(df.copy(deep=False))
     
-    def is_within_range(date_str):
-        parsed = parse_date(date_str)
-        if parsed is None:
-            return False
-        
-        # timezone 제거 (naive로 통일)
-        if parsed.tzinfo is not None:
-            parsed = parsed.replace(tzinfo=None)
-        
-        return parsed >= cutoff_date
+    cutoff_date = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days_ago)
     
     before_count = len(df)
-    df = df[df["date"].apply(is_within_range)]
+    df = df[df["published_at"] >= cutoff_date]
     df = df.reset_index(drop=True)
     after_count = len(df)
     
@@ -210,80 +720,458 @@ def filter_by_date(df, days_ago):
     
     return df
 
-def crawl_all(keywords_dict, naver_id, naver_secret, days_ago=7):
+def plan_query(days_ago):
     """
-    전체 키워드 크롤링
+    기간 기반 쿼리 계획
+    - 구글: 검색 연산자로 기간 지정 (30일 이하 when:Nd, 초과 after:날짜)
+    - 네이버: 날짜순 페이지를 기간 밖까지 이동 (기간이 길수록 페이지 확대)
+    """
+    weeks = max(1, math.ceil(days_ago / 7))
+    cutoff = to_utc(datetime.now() - timedelta(days=days_ago))
+    
+    if days_ago <= 30:
+        google_operator = f"when:{max(1, days_ago)}d"
+    else:
+        google_operator = f"after:{cutoff.strftime('%Y-%m-%d')}"
+    
+    return {
+        "cutoff": cutoff,
+        "google_operator": google_operator,
+        "google_num": min(CRAWL_CONFIG.get("google_num_max", 100), CRAWL_CONFIG.get("google_num", 20) * weeks),
+        "naver_display": min(100, CRAWL_CONFIG.get("naver_display", 20) * weeks),
+        "naver_max_pages": min(CRAWL_CONFIG.get("window_max_pages", 10), weeks + 1),
+        # 수집 미완료 태스크 (워터마크 갱신 제외)
+        "incomplete": set(),
+    }
+
+
+def crawl_keyword(category, keyword, naver_id, naver_secret, state=None, plan=None):
+    """
+    단일 키워드 크롤링
     - 한글 키워드 → 네이버 API
     - 영문 키워드 → Google RSS
+    - state가 있으면 증분 모드 (워터마크 이후 신규 기사만)
+    - plan: 기간 기반 쿼리 계획 (plan_query)
     """
-    all_articles = []
-    delay = CRAWL_CONFIG.get("delay", 0.5)
-    naver_display = CRAWL_CONFIG.get("naver_display", 20)
-    google_num = CRAWL_CONFIG.get("google_num", 20)
+    plan = plan or plan_query(7)
+    source = "naver" if is_korean(keyword) else "google"
+    status = {}
+    since, seen = get_watermark(state, source, keyword) if state is not None else (None, set())
     
-    total = sum(len(kws) for kws in keywords_dict.values())
-    current = 0
+    # 기간 시작 또는 워터마크 중 늦은 시각까지만
+    cutoff = plan["cutoff"]
+    since = cutoff if since is None else max(since, cutoff)
     
+    if source == "naver":
+        max_pages = plan["naver_max_pages"]
+        if state is not None:
+            max_pages = max(max_pages, CRAWL_CONFIG.get("naver_max_pages", 5))
+        articles = crawl_naver(keyword, naver_id, naver_secret, plan["naver_display"],
+                               since=since, seen=seen, max_pages=max_pages, status=status)
+    else:
+        articles = crawl_google_rss(keyword, plan["google_num"], lang="en",
+                                    since=since, seen=seen, cutoff=cutoff,
+                                    operator=plan["google_operator"], status=status)
+    
+    if not status.get("complete", False):
+        plan["incomplete"].add(keyword)
+    
+    # 카테고리 추가
+    for article in articles:
+        article["category"] = category
+    
+    return articles
+
+
+# ============================================================
+# 동의어 OR 배치 쿼리 (구글)
+# ============================================================
+def build_or_query(keywords):
+    """키워드 목록 → 구글 OR 쿼리 (공백 포함 키워드는 따옴표)"""
+    return " OR ".join(f'"{kw}"' if " " in kw else kw for kw in keywords)
+
+
+def plan_query_batches(keywords_dict):
+    """
+    크롤링 작업 목록 생성 [(카테고리, [키워드, ...]), ...]
+    - 한글 키워드 → 단독 (네이버)
+    - 영문 키워드 → 카테고리별 OR 배치 (쿼리 길이 상한 초과 시 분할)
+    """
+    batch_synonyms = CRAWL_CONFIG.get("batch_synonyms", True)
+    max_chars = CRAWL_CONFIG.get("google_batch_max_chars", 120)
+    
+    tasks = []
     for category, keywords in keywords_dict.items():
+        current = []
         for keyword in keywords:
-            current += 1
-            
-            if is_korean(keyword):
-                # 한글 → 네이버
-                print(f"🔍 [{current}/{total}] 네이버: {keyword}")
-                articles = crawl_naver(keyword, naver_id, naver_secret, naver_display)
-            else:
-                # 영문 → 구글 RSS
-                print(f"🔍 [{current}/{total}] 구글: {keyword}")
-                articles = crawl_google_rss(keyword, google_num, lang="en")
-            
-            # 카테고리 추가
-            for article in articles:
-                article["category"] = category
+            if is_korean(keyword) or not batch_synonyms:
+                tasks.append((category, [keyword]))
+                continue
             
-            all_articles.extend(articles)
-            time.sleep(delay)
+            if current and len(build_or_query(current + [keyword])) > max_chars:
+                tasks.append((category, current))
+                current = []
+            current.append(keyword)
+        
+        if current:
+            tasks.append((category, current))
+    
+    return tasks
+
+
+def attribute_keywords(articles, keywords):
+    """
+    배치 결과를 키워드별로 귀속
+    - 제목/스니펫에 단어로 등장한 키워드마다 1건씩 (없으면 첫 키워드)
+      ("LLDPE"는 LDPE로 귀속하지 않음)
+    - 키워드 순서대로 반환 (단건 쿼리와 같은 순서)
+    """
+    patterns = [
+        (keyword, re.compile(rf"(?<![a-z0-9]){re.escape(keyword.lower())}(?![a-z0-9])"))
+        for keyword in keywords
+    ]
+    
+    hits = {keyword: [] for keyword in keywords}
+    for article in articles:
+        text = f"{article.get('title', '')} {article.get('snippet', '')}".lower()
+        matched = [keyword for keyword, pattern in patterns if pattern.search(text)] or keywords[:1]
+        for keyword in matched:
+            hits[keyword].append({**article, "keyword": keyword})
+    
+    return [article for keyword in keywords for article in hits[keyword]]
+
+
+def google_batch_num(keywords, plan):
+    """배치 요청 결과 수 (키워드당 google_num × 키워드 수, google_num_max 상한)"""
+    return min(CRAWL_CONFIG.get("google_num_max", 100), plan["google_num"] * len(keywords))
+
+
+def exceeds_feed_cap(keywords, plan):
+    """키워드당 google_num건을 피드 1회(google_num_max)로 받을 수 없는 배치"""
+    return len(keywords) > 1 and plan["google_num"] * len(keywords) > CRAWL_CONFIG.get("google_num_max", 100)
+
+
+def crawl_google_batch(keywords, plan, since=None, seen=None, status=None):
+    """
+    구글 OR 배치 검색
+    - 키워드당 google_num건 × 키워드 수 요청 (google_num_max 상한)
+    - 요청량이 피드 상한을 넘는 배치는 조회 전에 절반씩 분할 (장기 기간)
+    - 피드 상한(google_num_max)에 걸리면 받은 결과는 유지하고,
+      google_num건이 안 모인 키워드가 있는 절반만 재검색 (이미 받은 링크 제외)
+    - status: {"complete": 모든 쿼리가 오류/상한 없이 끝났는지}
+    """
+    if status is None:
+        status = {}
+    status.setdefault("complete", True)
+    
+    if exceeds_feed_cap(keywords, plan):
+        mid = len(keywords) // 2
+        seen = set(seen or ())
+        hits = crawl_google_batch(keywords[:mid], plan, since, seen, status)
+        seen.update(hit["link"] for hit in hits)
+        return hits + crawl_google_batch(keywords[mid:], plan, since, seen, status)
+    
+    num = google_batch_num(keywords, plan)
+    seen = set(seen or ())
+    query_status = {}
+    articles = crawl_google_rss(build_or_query(keywords), num, lang="en",
+                                since=since, seen=seen, cutoff=plan["cutoff"],
+                                operator=plan["google_operator"], status=query_status)
+    if not query_status.get("complete", False):
+        status["complete"] = False
+    hits = attribute_keywords(articles, keywords)
+    
+    capped = len(articles) >= num and num >= CRAWL_CONFIG.get("google_num_max", 100)
+    if not capped or len(keywords) == 1:
+        return hits
+    
+    counts = Counter(hit["keyword"] for hit in hits)
+    seen.update(article["link"] for article in articles)
+    mid = len(keywords) // 2
+    for half in (keywords[:mid], keywords[mid:]):
+        if all(counts[keyword] >= plan["google_num"] for keyword in half):
+            continue
+        extra = crawl_google_batch(half, plan, since, seen, status)
+        seen.update(hit["link"] for hit in extra)
+        hits.extend(extra)
+    
+    # 키워드 순서 유지 (단건 쿼리와 같은 순서)
+    order = {keyword: i for i, keyword in enumerate(keywords)}
+    return sorted(hits, key=lambda hit: order[hit["keyword"]])
+
+
+def task_label(keywords):
+    """작업 표시/워터마크 키 (단건은 키워드 그대로)"""
+    return keywords[0] if len(keywords) == 1 else build_or_query(keywords)
+
+
+def crawl_task(category, keywords, naver_id, naver_secret, state=None, plan=None):
+    """
+    크롤링 작업 실행
+    - 키워드 1개 → crawl_keyword
+    - 영문 키워드 배치 → crawl_google_batch
+    """
+    if len(keywords) == 1:
+        return crawl_keyword(category, keywords[0], naver_id, naver_secret, state, plan)
+    
+    plan = plan or plan_query(7)
+    since, seen = get_watermark(state, "google", task_label(keywords)) if state is not None else (None, set())
+    since = plan["cutoff"] if since is None else max(since, plan["cutoff"])
+    
+    status = {}
+    articles = crawl_google_batch(keywords, plan, since, seen, status)
+    if not status["complete"]:
+        plan["incomplete"].add(task_label(keywords))
+    
+    # 카테고리 추가
+    for article in articles:
+        article["category"] = category
+    
+    return articles
+
+
+def aggregate_stories(df):
+    """
+    수집 히트 → 기사(링크)별 1행 집계 (groupby 1회)
+    - 기본 컬럼: 첫 히트 기준 (keyword/category 포함)
+    - keywords / categories: 매칭된 전체 목록 (", " 구분, 등장 순서)
+    - exposure_count: 서로 다른 (키워드, 카테고리, 소스) 히트 수
+    """
+    if df.empty:
+        return df
     
-# DataFrame 변환
+    hits = df.drop_duplicates(subset=["link", "keyword", "category", "source"])
+    grouped = hits.groupby("link", sort=False)
+    
+    summary = grouped.agg(
+        keywords=("keyword", lambda s: ", ".join(dict.fromkeys(s))),
+        categories=("category", lambda s: ", ".join(dict.fromkeys(s))),
+        exposure_count=("keyword", "size"),
+    )
+    
+    stories = hits.drop_duplicates(subset=["link"], keep="first")
+    stories = stories.join(summary, on="link")
+    stories = stories.reset_index(drop=True)
+    
+    print(f"📊 기사 집계: 히트 {len(df)}건 → 기사 {len(stories)}건")
+    return stories
+
+
+# 반복 값이 많은 문자열 컬럼 (category dtype)
+CATEGORICAL_COLUMNS = ["source", "category", "keyword", "keywords", "categories"]
+
+
+def compact_articles(df):
+    """
+    기사 테이블 메모리 절감 (제자리 변환)
+    - 반복 문자열 컬럼 → category dtype (고유값 1회 저장 + 정수 코드)
+    """
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    return df
+
+
+def prepare_crawl(keywords_dict, days_ago=7, incremental=None):
+    """
+    크롤링 준비 (배치/스트리밍 공통)
+    - 반환: (state, crawl_state, plan, tasks)
+    """
+    if incremental is None:
+        incremental = CRAWL_CONFIG.get("incremental", False)
+    
+    state = load_crawl_state()
+    crawl_state = state if incremental else None
+    plan = plan_query(days_ago)
+    print(f"🗓️ 쿼리 계획: 구글 {plan['google_operator']} {plan['google_num']}건 / "
+          f"네이버 {plan['naver_display']}건 × 최대 {plan['naver_max_pages']}페이지")
+    
+    tasks = plan_query_batches(keywords_dict)
+    keyword_count = sum(len(kws) for kws in keywords_dict.values())
+    if len(tasks) < keyword_count:
+        print(f"📦 동의어 배치: 키워드 {keyword_count}개 → 요청 {len(tasks)}개")
+    
+    return state, crawl_state, plan, tasks
+
+
+def task_source(keywords):
+    """태스크 소스 표시명 (한글 키워드 → 네이버)"""
+    return "네이버" if is_korean(keywords[0]) else "구글"
+
+
+def finish_crawl(state, tasks, results, days_ago, incomplete=(), resolved=None):
+    """
+    수집 결과 → 기사 테이블 (배치/스트리밍 공통)
+    - 워터마크 갱신 후 태스크 순서대로 합쳐 날짜 필터/정규 URL/집계
+    - incomplete: 수집 미완료 태스크 (실패/페이지·결과 상한) → 기존 워터마크 유지
+      (일부만 받은 결과로 갱신하면 그 사이 기사가 다음 증분 실행에서 누락)
+    - resolved: 스트리밍 단계에서 해석한 정규 URL {원래 링크: 정규 URL} (재요청 없음)
+    """
+    # 워터마크 갱신 (다음 증분 실행 기준)
+    kept = 0
+    for (category, keywords), articles in zip(tasks, results):
+        label = task_label(keywords)
+        if label in incomplete:
+            kept += 1
+            continue
+        source = "naver" if is_korean(keywords[0]) else "google"
+        update_watermark(state, source, label, articles)
+    save_crawl_state(state)
+    if kept:
+        print(f"⚠️ 수집 미완료 {kept}건: 워터마크 유지 (다음 실행에서 다시 수집)")
+    
+    all_articles = [article for articles in results for article in articles]
+    
+    # DataFrame 변환
     df = pd.DataFrame(all_articles)
     
-    # 링크 기준 중복 제거 (1차)
     if not df.empty:
-        df = df.drop_duplicates(subset=["link"], keep="first")
-        df = df.reset_index(drop=True)
+        # 날짜 정규화 (published_at, age_hours)
+        df = add_date_columns(df)
         
         # 날짜 필터링
         df = filter_by_date(df, days_ago)
         
+        # 정규 URL 해석 (구글 리다이렉트 → 원문)
+        if CRAWL_CONFIG.get("resolve_canonical", True) and not df.empty:
+            df["raw_link"] = df["link"]
+            df["link"] = df["link"].map(resolve_canonical_links(df["link"].tolist(), resolved))
+        
+        # 링크 기준 기사 집계 (키워드/카테고리 목록 + 노출 횟수)
+        df = aggregate_stories(df)
+        df = compact_articles(df)
+        
         print(f"✅ 총 {len(df)}건 수집 완료 (날짜 필터 적용)")
     
+    stats = get_http_stats()
+    print(f"🔌 HTTP 커넥션: 신규 {stats['opened']} / 재사용 {stats['reused']}")
+    
     return df
 
 
+def crawl_all(keywords_dict, naver_id, naver_secret, days_ago=7, incremental=None):
+    """
+    전체 키워드 크롤링
+    - 한글 키워드 → 네이버 API
+    - 영문 키워드 → Google RSS
+    - concurrent 모드: 스레드 풀 + 소스별 토큰 버킷 (고정 delay 없음)
+    - incremental 모드: 키워드/소스별 워터마크 이후 신규 기사만 수집
+    """
+    state, crawl_state, plan, tasks = prepare_crawl(keywords_dict, days_ago, incremental)
+    total = len(tasks)
+    
+    # 키워드 순서대로 결과 보관 (링크 중복 제거 시 keep="first" 유지)
+    results = [[] for _ in tasks]
+    
+    if CRAWL_CONFIG.get("concurrent", True):
+        max_workers = max(1, CRAWL_CONFIG.get("max_workers", 8))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(crawl_task, category, keywords, naver_id, naver_secret, crawl_state, plan): i
+                for i, (category, keywords) in enumerate(tasks)
+            }
+            
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    print(f"❌ 수집 실패 [{task_label(tasks[i][1])}]: {e}")
+                    plan["incomplete"].add(task_label(tasks[i][1]))
+                keywords = tasks[i][1]
+                print(f"🔍 [{done}/{total}] {task_source(keywords)}: {task_label(keywords)} ({len(results[i])}건)")
+    else:
+        delay = CRAWL_CONFIG.get("delay", 0.5)
+        
+        for i, (category, keywords) in enumerate(tasks):
+            print(f"🔍 [{i+1}/{total}] {task_source(keywords)}: {task_label(keywords)}")
+            results[i] = crawl_task(category, keywords, naver_id, naver_secret, crawl_state, plan)
+            time.sleep(delay)
+    
+    return finish_crawl(state, tasks, results, days_ago, plan["incomplete"])
+
+
+def fetch_full_articles(urls):
+    """
+    본문 병렬 수집 (입력 순서 유지)
+    - 서로 다른 도메인은 동시에, 같은 도메인은 동시 접속/간격 제한
+    - 배치 타임아웃 초과분은 빈 문자열
+    """
+    total = len(urls)
+    texts = [""] * total
+    if total == 0:
+        return texts
+    
+    throttle = DomainThrottle(
+        CRAWL_CONFIG.get("fulltext_per_domain", 2),
+        CRAWL_CONFIG.get("fulltext_domain_delay", 1.0),
+    )
+    
+    def fetch(url):
+        with throttle.slot(url):
+            return download_full_article(url)
+    
+    # 캐시 히트는 네트워크/도메인 제한 없이 바로 사용
+    cache = get_article_cache()
+    pending = []
+    for i, url in enumerate(urls):
+        cached = cache.get(url)
+        if cached is None:
+            pending.append(i)
+        else:
+            texts[i] = cached
+    
+    if not pending:
+        return texts
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, CRAWL_CONFIG.get("fulltext_workers", 8)))
+    futures = {executor.submit(fetch, urls[i]): i for i in pending}
+    
+    done, not_done = wait(futures, timeout=CRAWL_CONFIG.get("fulltext_batch_timeout", 120))
+    for future in done:
+        try:
+            texts[futures[future]] = future.result()
+        except Exception:
+            pass
+    
+    # 남은 작업은 기다리지 않음
+    executor.shutdown(wait=False, cancel_futures=True)
+    if not_done:
+        print(f"⏱️ 본문 수집 타임아웃: {len(not_done)}건")
+    
+    return texts
+
+
 def crawl_with_fulltext(df):
     """
     DataFrame의 모든 기사 본문 수집
+    - 본문은 기사 캐시에만 저장 (테이블에는 has_full_text 표시)
+    - 필요할 때 fetch_full_article로 로드 (캐시 우선)
     """
     if df.empty:
         return df
     
-    df = df.copy()
-    full_texts = []
+    df = df.copy(deep=False)
     
     total = len(df)
-    for idx, row in df.iterrows():
-        print(f"📄 본문 수집 [{idx+1}/{total}] {row['title'][:40]}...")
-        full_text = fetch_full_article(row["link"])
-        full_texts.append(full_text)
-        time.sleep(0.3)
-    
-    df["full_text"] = full_texts
-    
-    # snippet이 비어있으면 full_text로 대체
-    df["snippet"] = df.apply(
-        lambda x: x["full_text"][:500] if not x["snippet"] and x["full_text"] else x["snippet"],
-        axis=1
-    )
+    print(f"📄 본문 수집 시작: {total}건")
+    cache = get_article_cache()
+    cache.reset_stats()
+    full_texts = fetch_full_articles(df["link"].tolist())
+    df["has_full_text"] = [bool(text) for text in full_texts]
+    
+    # snippet이 비어있으면 본문 앞부분으로 대체
+    df["snippet"] = [
+        text[:500] if not snippet and text else snippet
+        for snippet, text in zip(df["snippet"], full_texts)
+    ]
+    del full_texts
     
+    stats = get_http_stats()
     print(f"✅ 본문 수집 완료: {total}건")
-    return df
\ No newline at end of file
+    print(f"🔌 HTTP 커넥션: 신규 {stats['opened']} / 재사용 {stats['reused']}")
+    
+    cache_stats = cache.stats()
+    print(f"💾 본문 캐시: 히트 {cache_stats['hits']} / 미스 {cache_stats['misses']}")
+    return df
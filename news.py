@@ -5,13 +5,17 @@ Polymer 뉴스 대시보드 - Streamlit 메인
 import streamlit as st
 import pandas as pd
 import os
-import re
 from datetime import datetime, timedelta
 
-from config import KEYWORDS, MAIN_PRODUCT, MAIN_COMPANY, BONUS_PRODUCT, BONUS_COMPANY, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, OPENAI_KEY, SCORE_CONFIG
+from config import KEYWORDS, MAIN_PRODUCT, MAIN_COMPANY, BONUS_PRODUCT, BONUS_COMPANY, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, OPENAI_KEY, SCORE_CONFIG, PIPELINE_CONFIG, SUMMARY_CONFIG
 from crawler import crawl_all, crawl_with_fulltext
-from processor import remove_duplicates_by_similarity, count_exposures, calculate_strategy_score, get_top_articles
-from summarizer import summarize_dataframe
+from processor import (
+    remove_duplicates_by_similarity, count_exposures, calculate_strategy_score,
+    rank_with_candidate_pool, rerank, save_score_table, load_score_table,
+)
+from summarizer import summarize_dataframe, fill_missing_summaries
+from pipeline import stream_crawl
+from story_index import get_history_scope, suppress_reported_stories, record_reported_stories
 from mailer import create_html, send_outlook, save_draft, save_excel_report
 
 
@@ -160,6 +164,10 @@ else:
     period_label = f"올해 ({start.strftime('%Y')})"
 
 st.sidebar.info(f"📆 {period_label}")
+
+# 보고 이력 범위 (같은 종류 보고서끼리만 중복 제외)
+history_scope = None if use_custom_date else get_history_scope(period)
+
 st.sidebar.divider()
 
 # ============================================================
@@ -218,6 +226,15 @@ selected_categories = selected_main_product + selected_main_company + selected_b
 # Top N 설정
 top_n = st.sidebar.slider("Top N 기사", 10, 50, SCORE_CONFIG["top_n"])
 
+# 점수 가중치 (변경 즉시 재정렬)
+with st.sidebar.expander("🎚️ 점수 가중치"):
+    default_weights = SCORE_CONFIG["weights"]
+    score_weights = {
+        "title_boost": st.slider("제목 키워드", 0.0, 5.0, float(default_weights["title_boost"]), 0.1),
+        "multi_competitor": st.slider("경쟁사 복수 등장 (개당)", 0.0, 5.0, float(default_weights["multi_competitor"]), 0.1),
+        "exposure_count": st.slider("노출 횟수", 0.0, 5.0, float(default_weights["exposure_count"]), 0.1),
+    }
+
 # AI 요약 제외 옵션
 skip_summary = st.sidebar.checkbox(
     "⏩ AI 요약 제외 (수집 시간 단축)",
@@ -227,8 +244,11 @@ skip_summary = st.sidebar.checkbox(
 # ============================================================
 # 세션 상태
 # ============================================================
-if "news_df" not in st.session_state:
-    st.session_state.news_df = None
+# 점수 후보 테이블 (재정렬용, 이전 실행 결과 복원)
+if "score_df" not in st.session_state:
+    saved = load_score_table()
+    st.session_state.score_df = saved["table"] if saved else None
+    st.session_state.score_period = saved["period_label"] if saved else None
 
 # ============================================================
 # 주차별 통계 저장 함수
@@ -267,12 +287,21 @@ def save_weekly_summary(df, period_label):
     
     print(f"📈 주차 통계 저장: {week_file}")
 
+# ============================================================
+# 날짜 표시 (published_at → 한국 시간)
+# ============================================================
+def format_published(row, fmt="%Y-%m-%d %H:%M"):
+    published = row.get("published_at")
+    if published is None or pd.isna(published):
+        return row.get("date", "") or ""
+    return published.tz_convert("Asia/Seoul").strftime(fmt)
+
 # ============================================================
 # 메인 영역
 # ============================================================
 
 if st.button("🚀 뉴스 수집 시작", type="primary", use_container_width=True):
-    
+
     if not naver_id or not naver_secret:
         st.error("네이버 API 키를 입력해주세요!")
     elif not selected_main:
@@ -282,55 +311,87 @@ if st.button("🚀 뉴스 수집 시작", type="primary", use_container_width=Tr
     else:
         keywords_to_search = {cat: KEYWORDS[cat] for cat in selected_categories}
         
-        # Step 1: 크롤링
+        # Step 1: 크롤링 (스트리밍: 수집 중 상위 기사 본문 선행)
         with st.spinner("🔍 뉴스 수집 중..."):
-            df = crawl_all(keywords_to_search, naver_id, naver_secret, days_ago)
+            if PIPELINE_CONFIG.get("streaming", True):
+                df = stream_crawl(keywords_to_search, naver_id, naver_secret, days_ago, top_n)
+            else:
+                df = crawl_all(keywords_to_search, naver_id, naver_secret, days_ago)
         
         if df.empty:
             st.warning("검색 결과가 없습니다.")
         else:
-            # Step 2: 노출 횟수 계산
+            # Step 2: 보고 이력 중복 제외 (지난 보고서에 나간 기사)
+            with st.spinner("🗂️ 보고 이력 확인 중..."):
+                df = suppress_reported_stories(df, history_scope)
+            
+            # Step 3: 노출 횟수 계산
             with st.spinner("📊 노출 횟수 계산 중..."):
                 df = count_exposures(df)
             
-            # Step 3: 유사도 중복 제거
-            with st.spinner("🧹 중복 제거 중..."):
-                df = remove_duplicates_by_similarity(df, SCORE_CONFIG["similarity_threshold"])
+            if PIPELINE_CONFIG.get("cheap_first", True):
+                # Step 4-5: 점수 우선 → 상위 후보만 중복 제거
+                with st.spinner("📊 전략 점수 계산 중..."):
+                    scored_df = rank_with_candidate_pool(df, top_n, SCORE_CONFIG["similarity_threshold"])
+            else:
+                # Step 4: 유사도 중복 제거
+                with st.spinner("🧹 중복 제거 중..."):
+                    df = remove_duplicates_by_similarity(df, SCORE_CONFIG["similarity_threshold"])
+                
+                # Step 5: 전략 점수
+                with st.spinner("📊 전략 점수 계산 중..."):
+                    scored_df = calculate_strategy_score(df)
             
-            # Step 4: 전략 점수
-            with st.spinner("📊 전략 점수 계산 중..."):
-                df = calculate_strategy_score(df)
-                df = get_top_articles(df, top_n)
+            df = rerank(scored_df, weights=score_weights, top_n=top_n)
             
-            # Step 5: 본문 크롤링
+            # Step 6: 본문 크롤링
             with st.spinner("📄 본문 수집 중..."):
                 df = crawl_with_fulltext(df)
             
-            # Step 6: GPT 요약
-            if skip_summary:
-                df["summary"] = "-"
-                st.info("⏩ AI 요약 생략됨")
-            elif openai_key:
-                with st.spinner("🤖 AI 요약 생성 중..."):
-                    df = summarize_dataframe(df, openai_key, delay=0.5)
+            # Step 7: GPT 요약 (AI 요약 제외/키 없음 → 본문 추출 요약)
+            # 추출 요약 모드에서는 키를 넘기지 않음 (네트워크 없음)
+            llm_key = openai_key if SUMMARY_CONFIG.get("mode", "llm") == "llm" else None
+            if skip_summary or not llm_key:
+                with st.spinner("📝 추출 요약 생성 중..."):
+                    df = summarize_dataframe(df, None, mode="extractive")
+                if skip_summary:
+                    st.info("⏩ AI 요약 생략됨 - 본문 추출 요약 사용")
+                elif not openai_key:
+                    st.warning("OpenAI Key 없음 - 본문 추출 요약 사용")
             else:
-                df["summary"] = "API 키 없음"
-                st.warning("OpenAI Key 없음 - 요약 생략")
+                with st.spinner("🤖 AI 요약 생성 중..."):
+                    df = summarize_dataframe(df, llm_key)
             
-            # Step 7: 주차 통계 저장
+            # Step 8: 주차 통계 저장
             save_weekly_summary(df, period_label)
             
-            st.session_state.news_df = df
+            # Step 9: 보고 이력 저장 (다음 실행 중복 제외 기준)
+            record_reported_stories(df, history_scope)
+            
+            # Step 10: 점수 후보 테이블 저장 (요약 포함, 재정렬용)
+            extra_columns = ["link"] + [c for c in df.columns if c not in scored_df.columns]
+            scored_df = scored_df.merge(df[extra_columns], on="link", how="left")
+            save_score_table(scored_df, period_label)
+            
+            st.session_state.score_df = scored_df
+            st.session_state.score_period = period_label
             st.success(f"✅ {len(df)}건 수집 완료!")
 
 # ============================================================
 # 결과 표시
 # ============================================================
-if st.session_state.news_df is not None:
-    df = st.session_state.news_df
+if st.session_state.score_df is not None:
+    # 가중치/Top N 변경 시 저장된 점수 구성 요소로 즉시 재정렬
+    df = rerank(st.session_state.score_df, weights=score_weights, top_n=top_n)
+    result_period = st.session_state.score_period or period_label
+    
+    # 재정렬로 새로 들어온 기사는 요약 없음 → 추출 요약
+    df, filled_summary = fill_missing_summaries(df)
+    if filled_summary:
+        st.info(f"ℹ️ 재정렬로 추가된 {filled_summary}건은 본문 추출 요약 (다시 수집하면 AI 요약)")
     
     st.divider()
-    st.subheader(f"📰 {period_label} 뉴스 (Top {len(df)})")
+    st.subheader(f"📰 {result_period} 뉴스 (Top {len(df)})")
     
     # 탭
     categories = df["category"].unique().tolist()
@@ -338,11 +399,11 @@ if st.session_state.news_df is not None:
     
     with tabs[0]:
         for _, row in df.iterrows():
-            date_str = row.get('date', '') or ''
-            date_short = re.split(r'\d{2}:\d{2}', date_str)[0].strip().rstrip(',')
+            date_short = format_published(row, "%m/%d")
             source = row.get('source', '')
-            with st.expander(f"**[{row['category']}]** {row['title'][:70]}... ({date_short} | {source})"):
-                st.markdown(f"**키워드:** {row['keyword']} | **소스:** {row['source']} | **날짜:** {row.get('date', '')}")
+            follow_up = "🔁 " if bool(row.get('follow_up', False)) else ""
+            with st.expander(f"{follow_up}**[{row['category']}]** {row['title'][:70]}... ({date_short} | {source})"):
+                st.markdown(f"**키워드:** {row['keyword']} | **소스:** {row['source']} | **날짜:** {format_published(row)}")
                 st.markdown(f"**요약:** {row.get('summary', '')}")
                 st.markdown(f"[기사 원문 →]({row['link']})")
     
@@ -351,9 +412,9 @@ if st.session_state.news_df is not None:
             cat_df = df[df["category"] == category]
             st.caption(f"{len(cat_df)}건")
             for _, row in cat_df.iterrows():
-                date_short = row.get('date', '')[:20] if row.get('date') else ''
+                date_short = format_published(row, "%m/%d %H:%M")
                 with st.expander(f"**[{row['keyword']}]** {row['title'][:60]}... ({date_short})"):
-                    st.markdown(f"**소스:** {row['source']} | **날짜:** {row.get('date', '')}")
+                    st.markdown(f"**소스:** {row['source']} | **날짜:** {format_published(row)}")
                     st.markdown(f"**요약:** {row.get('summary', '')}")
                     st.markdown(f"[기사 원문 →]({row['link']})")
     
@@ -367,7 +428,7 @@ if st.session_state.news_df is not None:
     
     with col1:
         if st.button("📊 Excel 저장"):
-            filepath = save_excel_report(df, period_label)
+            filepath = save_excel_report(df, result_period)
             st.success(f"저장: {filepath}")
     
     with col2:
@@ -378,15 +439,15 @@ if st.session_state.news_df is not None:
         with col3a:
             if st.button("📧 발송"):
                 if to_email:
-                    send_outlook(df, period_label, to_email)
+                    send_outlook(df, result_period, to_email)
                     st.success("발송 완료!")
         with col3b:
             if st.button("💾 임시저장"):
-                save_draft(df, period_label, to_email)
+                save_draft(df, result_period, to_email)
                 st.success("저장 완료!")
     
     # 이메일 미리보기 (아래쪽 전체 너비)
     st.divider()
     if st.button("👁️ 이메일 미리보기", use_container_width=True):
-        html = create_html(df, period_label)
+        html = create_html(df, result_period)
         st.components.v1.html(html, height=800, scrolling=True)
@@ -0,0 +1,207 @@
+"""
+스트리밍 파이프라인
+- 수집 태스크가 끝나는 대로 배치 단위 처리 (bounded queue)
+- 배치별: 날짜 정규화 → 날짜 필터 → 정규 URL → 잠정 점수
+- 잠정 Top N 기사는 수집 중에 본문 선행 수집 (기사 캐시 워밍)
+- 요약은 선행하지 않음: 남은 태스크의 최대 히트 수로는 수집 끝 무렵에야 Top N이 확정되고,
+  화면 가중치로 재정렬되므로 최종 요약 단계(비동기 엔진/속도 제한/배치)에서 한 번에 처리
+- 최종 테이블은 배치 모드(crawl_all)와 같은 함수로 조립 → 결과 동일
+"""
+
+import queue
+import threading
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import CRAWL_CONFIG, PIPELINE_CONFIG, SCORE_CONFIG
+from crawler import (
+    prepare_crawl, finish_crawl, crawl_task, task_label, task_source,
+    add_date_columns, filter_by_date, resolve_canonical_links, aggregate_stories,
+    get_article_cache, download_full_article, DomainThrottle,
+)
+from processor import calculate_strategy_score
+
+
+# 수집 종료 표시
+_DONE = object()
+
+
+class ArticlePrefetcher:
+    """
+    수집 중 본문 선행 수집
+    - 기사 캐시에 저장 (최종 본문 수집에서 캐시 히트)
+    - 같은 기사는 1회만 처리
+    """
+    
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.first_ready = None
+        self.fetching = set()
+        self.lock = threading.Lock()
+        self.throttle = DomainThrottle(
+            CRAWL_CONFIG.get("fulltext_per_domain", 2),
+            CRAWL_CONFIG.get("fulltext_domain_delay", 1.0),
+        )
+        self.executor = ThreadPoolExecutor(max_workers=max(1, PIPELINE_CONFIG.get("prefetch_workers", 4)))
+    
+    def full_text(self, url):
+        """본문 (캐시 → 도메인 제한 후 다운로드)"""
+        cached = get_article_cache().get(url)
+        if cached is not None:
+            return cached
+        with self.throttle.slot(url):
+            return download_full_article(url)
+    
+    def fetch(self, rows):
+        """잠정 Top N 본문 선행 수집"""
+        for link in rows["link"]:
+            if link in self.fetching:
+                continue
+            self.fetching.add(link)
+            self.executor.submit(self._fetch, link)
+    
+    def _fetch(self, link):
+        try:
+            self.full_text(link)
+        except Exception:
+            return
+        self._mark_ready()
+    
+    def _mark_ready(self):
+        with self.lock:
+            if self.first_ready is None:
+                self.first_ready = time.monotonic() - self.started_at
+                print(f"⏱️ 첫 기사 준비: {self.first_ready:.1f}초 (수집 진행 중)")
+    
+    def close(self):
+        """시작된 작업은 마치고 대기 작업은 취소"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _crawl_producer(tasks, naver_id, naver_secret, crawl_state, plan, out_queue):
+    """수집 태스크 실행 → 완료 순서대로 (태스크 번호, 결과) 전달 (큐가 차면 대기)"""
+    max_workers = max(1, CRAWL_CONFIG.get("max_workers", 8))
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(crawl_task, category, keywords, naver_id, naver_secret, crawl_state, plan): i
+                for i, (category, keywords) in enumerate(tasks)
+            }
+            
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    articles = future.result()
+                except Exception as e:
+                    print(f"❌ 수집 실패 [{task_label(tasks[i][1])}]: {e}")
+                    plan["incomplete"].add(task_label(tasks[i][1]))
+                    articles = []
+                out_queue.put((i, articles))
+    finally:
+        out_queue.put(_DONE)
+
+
+def prepare_batch(articles, days_ago, resolved=None):
+    """
+    수집 배치 → 잠정 처리된 히트 (날짜 정규화/필터, 정규 URL)
+    - resolved: 정규 URL 해석 누적 {원래 링크: 정규 URL} (최종 조립에서 재사용)
+    """
+    df = pd.DataFrame(articles)
+    if df.empty:
+        return df
+    
+    df = filter_by_date(add_date_columns(df), days_ago)
+    if CRAWL_CONFIG.get("resolve_canonical", True) and not df.empty:
+        mapping = resolve_canonical_links(df["link"].tolist(), resolved)
+        if resolved is not None:
+            resolved.update(mapping)
+        df["link"] = df["link"].map(mapping)
+    return df
+
+
+# 잠정 순위 테이블 컬럼
+PROVISIONAL_COLUMNS = ["link", "title", "snippet", "rank_combo", "strategy_score"]
+
+
+def update_provisional(provisional, hits, links):
+    """
+    잠정 순위 갱신 (새 배치에 등장한 링크만 재집계/재점수)
+    - 기사 점수는 자기 히트에만 의존 → 나머지 행은 그대로 재사용
+    """
+    stories = aggregate_stories(hits[hits["link"].isin(links)])
+    scored = calculate_strategy_score(stories)
+    
+    if not provisional.empty:
+        provisional = provisional[~provisional["link"].isin(links)]
+    if not scored.empty:
+        provisional = pd.concat([provisional, scored[PROVISIONAL_COLUMNS]], ignore_index=True)
+    if provisional.empty:
+        return provisional
+    
+    provisional = provisional.sort_values(["rank_combo", "strategy_score"], ascending=[True, False])
+    return provisional.reset_index(drop=True)
+
+
+def stream_crawl(keywords_dict, naver_id, naver_secret, days_ago=7, top_n=None, incremental=None):
+    """
+    스트리밍 크롤링
+    - 수집과 동시에 잠정 점수 → 잠정 Top N 본문 선행 수집
+    - 반환: crawl_all과 같은 기사 테이블
+    """
+    if top_n is None:
+        top_n = SCORE_CONFIG["top_n"]
+    if incremental is None:
+        incremental = CRAWL_CONFIG.get("incremental", False)
+    
+    state, crawl_state, plan, tasks = prepare_crawl(keywords_dict, days_ago, incremental)
+    total = len(tasks)
+    results = [[] for _ in tasks]
+    
+    batches = queue.Queue(maxsize=max(1, PIPELINE_CONFIG.get("queue_size", 4)))
+    producer = threading.Thread(
+        target=_crawl_producer,
+        args=(tasks, naver_id, naver_secret, crawl_state, plan, batches),
+        daemon=True,
+    )
+    prefetcher = ArticlePrefetcher()
+    producer.start()
+    
+    hits = pd.DataFrame()
+    provisional = pd.DataFrame()
+    resolved = {}
+    done = 0
+    finished = False
+    try:
+        while True:
+            item = batches.get()
+            if item is _DONE:
+                finished = True
+                break
+            
+            i, articles = item
+            results[i] = articles
+            done += 1
+            keywords = tasks[i][1]
+            print(f"🔍 [{done}/{total}] {task_source(keywords)}: {task_label(keywords)} ({len(articles)}건)")
+            
+            batch = prepare_batch(articles, days_ago, resolved)
+            if not batch.empty:
+                hits = pd.concat([hits, batch], ignore_index=True)
+                provisional = update_provisional(provisional, hits, batch["link"].unique())
+            if provisional.empty:
+                continue
+            
+            prefetcher.fetch(provisional.head(top_n))
+    finally:
+        # 처리 중 오류 시에도 수집 스레드가 큐에서 막히지 않게 비움
+        while not finished:
+            finished = batches.get() is _DONE
+        producer.join()
+        prefetcher.close()
+    
+    print(f"⚡ 선행 처리: 본문 {len(prefetcher.fetching)}건")
+    
+    # 최종 조립 (태스크 순서, 배치 모드와 동일)
+    return finish_crawl(state, tasks, results, days_ago, plan["incomplete"], resolved)
@@ -4,18 +4,22 @@
 - 신선도, 노출횟수 반영
 """
 
+import os
+import pickle
 import pandas as pd
 import numpy as np
-import re
+from collections import deque
 from datetime import datetime
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from config import (
-    SCORE_CONFIG, SOURCE_PRIORITY,
+    SCORE_CONFIG, SOURCE_PRIORITY, PIPELINE_CONFIG,
     MAIN_PRODUCT, MAIN_COMPANY,
     BONUS_PRODUCT, BONUS_COMPANY,
     KEYWORD_MAPPING
 )
+from crawler import add_date_columns
 
 
 def get_mapped_keywords(keyword):
@@ -27,47 +31,277 @@ def get_mapped_keywords(keyword):
     return keywords
 
 
-def check_keyword_in_text(text, keyword):
-    """텍스트에 키워드 포함 여부"""
-    text_lower = text.lower()
-    for kw in get_mapped_keywords(keyword):
-        if kw in text_lower:
-            return True
-    return False
+# ============================================================
+# 키워드 매칭 (Aho-Corasick, 기사당 1회 스캔)
+# ============================================================
+KEYWORD_GROUPS = {
+    "main_product": MAIN_PRODUCT,
+    "main_company": MAIN_COMPANY,
+    "bonus_product": BONUS_PRODUCT,
+    "bonus_company": BONUS_COMPANY,
+}
 
 
-def remove_duplicates_by_similarity(df, threshold=0.8):
-    if df.empty or len(df) < 2:
-        return df
+class KeywordMatcher:
+    """
+    Aho-Corasick 키워드 매칭기
+    - 전체 키워드(+ KEYWORD_MAPPING 매핑어)를 1회 컴파일
+    - match(): 기사당 1회 스캔으로 키워드별 등장 여부/제목 등장 여부 반환
+    """
     
-    df = df.copy()
-    
-    # 불용어 (자주 바뀌는 동사/관사 등)
-    stopwords = [
-        # 영문 동사
-        'sets', 'set', 'up', 'launches', 'launch', 'secures', 'secure',
-        'advances', 'advance', 'begins', 'begin', 'starts', 'start',
-        'announces', 'announce', 'unveils', 'unveil', 'reveals', 'reveal',
-        'plans', 'plan', 'opens', 'open', 'closes', 'close',
-        # 영문 관사/전치사
-        'the', 'a', 'an', 'to', 'for', 'with', 'in', 'on', 'at', 'by',
-        'its', 'their', 'new', 'will', 'has', 'have', 'is', 'are',
-        # 한글 동사/조사
-        '개최', '열어', '진행', '발표', '공개', '시작', '추진', '계획',
-        '을', '를', '이', '가', '은', '는', '의', '에', '에서', '로', '으로',
-    ]
+    def __init__(self, keyword_groups):
+        self.entries = []       # entry_id → (그룹, 카테고리, 키워드)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]      # 노드 → [entry_id, ...]
+        
+        for group, categories in keyword_groups.items():
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    entry_id = len(self.entries)
+                    self.entries.append((group, category, keyword))
+                    for pattern in set(get_mapped_keywords(keyword)):
+                        self._add(pattern, entry_id)
+        
+        self._build()
+    
+    def _add(self, pattern, entry_id):
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = nxt
+        self.output[node].append(entry_id)
+    
+    def _build(self):
+        """실패 링크 생성 (BFS)"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+    
+    def match(self, title, snippet):
+        """
+        제목+스니펫 1회 스캔
+        반환: {entry_id: 제목 안에서 등장 여부}
+        """
+        title = f"{title}".lower()
+        text = f"{title} {snippet}".lower()
+        title_len = len(title)
+        
+        goto, fail, output = self.goto, self.fail, self.output
+        hits = {}
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            
+            for entry_id in output[node]:
+                hits[entry_id] = hits.get(entry_id, False) or i < title_len
+        
+        return hits
+    
+    def summarize(self, hits):
+        """
+        매칭 결과 → 점수용 요약
+        - categories: 그룹별 매칭 카테고리 (config 순서)
+        - keyword_counts: 그룹별 매칭 키워드 수
+        - title_groups: 제목에 키워드가 등장한 그룹
+        """
+        categories = {group: [] for group in KEYWORD_GROUPS}
+        keyword_counts = {group: 0 for group in KEYWORD_GROUPS}
+        title_groups = set()
+        
+        for entry_id in sorted(hits):
+            group, category, _ = self.entries[entry_id]
+            if category not in categories[group]:
+                categories[group].append(category)
+            keyword_counts[group] += 1
+            if hits[entry_id]:
+                title_groups.add(group)
+        
+        return {
+            "categories": categories,
+            "keyword_counts": keyword_counts,
+            "title_groups": title_groups,
+        }
+
+
+_keyword_matcher = None
+
+
+def get_keyword_matcher():
+    """키워드 매칭기 (최초 1회 컴파일)"""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        _keyword_matcher = KeywordMatcher(KEYWORD_GROUPS)
+    return _keyword_matcher
+
+
+def match_keywords(df):
+    """
+    기사별 키워드 매칭 (기사당 1회 스캔)
+    - 카테고리 플래그 / 제목 Main 키워드 여부 / 경쟁사 키워드 수
+    """
+    matcher = get_keyword_matcher()
+    
+    rows = []
+    for title, snippet in zip(df.get("title", pd.Series("", index=df.index)),
+                              df.get("snippet", pd.Series("", index=df.index))):
+        summary = matcher.summarize(matcher.match(title, snippet))
+        categories = summary["categories"]
+        rows.append({
+            "has_main_product": len(categories["main_product"]) > 0,
+            "has_main_company": len(categories["main_company"]) > 0,
+            "has_bonus_product": len(categories["bonus_product"]) > 0,
+            "has_bonus_company": len(categories["bonus_company"]) > 0,
+            "main_keywords": ", ".join(categories["main_product"] + categories["main_company"]),
+            "bonus_keywords": ", ".join(categories["bonus_product"] + categories["bonus_company"]),
+            "title_main_hit": bool(summary["title_groups"] & {"main_product", "main_company"}),
+            "competitor_count": summary["keyword_counts"]["bonus_company"],
+        })
+    
+    return pd.DataFrame(rows, index=df.index)
+
+
+# ============================================================
+# 유사도 중복 제거 (희소 블록 연산 + 연결 요소)
+# ============================================================
+# 불용어 (자주 바뀌는 동사/관사 등)
+SIMILARITY_STOPWORDS = {
+    # 영문 동사
+    'sets', 'set', 'up', 'launches', 'launch', 'secures', 'secure',
+    'advances', 'advance', 'begins', 'begin', 'starts', 'start',
+    'announces', 'announce', 'unveils', 'unveil', 'reveals', 'reveal',
+    'plans', 'plan', 'opens', 'open', 'closes', 'close',
+    # 영문 관사/전치사
+    'the', 'a', 'an', 'to', 'for', 'with', 'in', 'on', 'at', 'by',
+    'its', 'their', 'new', 'will', 'has', 'have', 'is', 'are',
+    # 한글 동사/조사
+    '개최', '열어', '진행', '발표', '공개', '시작', '추진', '계획',
+    '을', '를', '이', '가', '은', '는', '의', '에', '에서', '로', '으로',
+}
+
+
+def get_compare_text(title, snippet):
+    """유사도 비교용 텍스트 (제목 + 스니펫 앞 200자, 불용어 제거)"""
+    title = str(title).lower()
+    snippet = str(snippet)[:200].lower()
+    text = f"{title} {snippet}"
+    
+    # 불용어 제거
+    words = text.split()
+    filtered = [w for w in words if w not in SIMILARITY_STOPWORDS]
+    return " ".join(filtered)
+
+
+def find_similar_pairs(matrix, threshold, block_size=1024):
+    """
+    희소 TF-IDF 행렬에서 코사인 유사도 threshold 이상인 쌍 (i < j)
+    - 행/열 블록 단위로 계산 → n×n 행렬을 만들지 않음 (블록 크기만큼만 메모리 사용)
+    - TfidfVectorizer 기본 L2 정규화 → 내적 = 코사인 유사도
+    """
+    n = matrix.shape[0]
+    matrix = matrix.tocsr()
+    
+    for row_start in range(0, n, block_size):
+        row_block = matrix[row_start:row_start + block_size]
+        
+        for col_start in range(row_start, n, block_size):
+            col_block = matrix[col_start:col_start + block_size]
+            sims = (row_block @ col_block.T).tocoo()
+            
+            rows = sims.row + row_start
+            cols = sims.col + col_start
+            mask = (sims.data >= threshold) & (cols > rows)
+            if mask.any():
+                yield rows[mask], cols[mask]
+
+
+def find_neighbor_pairs(matrix, rows, threshold, block_size=1024):
+    """
+    지정 행(rows)과 전체 행 사이 유사도 threshold 이상인 쌍
+    - 후보 풀 기준 클러스터링용 (rows × n 블록 연산)
+    """
+    n = matrix.shape[0]
     
-    def get_compare_text(row):
-        title = str(row.get("title", "")).lower()
-        snippet = str(row.get("snippet", ""))[:200].lower()
-        text = f"{title} {snippet}"
+    for row_start in range(0, len(rows), block_size):
+        block_rows = rows[row_start:row_start + block_size]
+        row_block = matrix[block_rows]
         
-        # 불용어 제거
-        words = text.split()
-        filtered = [w for w in words if w not in stopwords]
-        return " ".join(filtered)
+        for col_start in range(0, n, block_size):
+            sims = (row_block @ matrix[col_start:col_start + block_size].T).tocoo()
+            mask = sims.data >= threshold
+            if mask.any():
+                yield block_rows[sims.row[mask]], sims.col[mask] + col_start
+
+
+def cluster_similar(matrix, threshold, block_size=None, seeds=None):
+    """
+    유사 기사 클러스터링 (연결 요소 = Union-Find와 동일 결과)
+    - 반환: 행별 클러스터 대표 인덱스 (클러스터 내 최소 인덱스, 재현 가능)
+    - seeds 지정 시: seeds와 연결된 클러스터만 계산 (나머지 행은 -1)
+    """
+    if block_size is None:
+        block_size = SCORE_CONFIG.get("similarity_block_size", 1024)
+    
+    n = matrix.shape[0]
+    matrix = matrix.tocsr()
+    
+    if seeds is None:
+        pairs = list(find_similar_pairs(matrix, threshold, block_size))
+        visited = np.ones(n, dtype=bool)
+    else:
+        # seeds에서 출발해 유사 기사를 따라 확장 (클러스터 전체가 포함될 때까지)
+        pairs = []
+        visited = np.zeros(n, dtype=bool)
+        frontier = np.unique(np.asarray(seeds, dtype=np.int64))
+        visited[frontier] = True
+        while len(frontier):
+            found = list(find_neighbor_pairs(matrix, frontier, threshold, block_size))
+            pairs.extend(found)
+            neighbors = np.unique(np.concatenate([p[1] for p in found])) if found else np.empty(0, dtype=np.int64)
+            frontier = neighbors[~visited[neighbors]]
+            visited[frontier] = True
+    
+    if not pairs:
+        return np.where(visited, np.arange(n), -1)
+    
+    rows = np.concatenate([p[0] for p in pairs])
+    cols = np.concatenate([p[1] for p in pairs])
+    graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+    _, components = connected_components(graph, directed=False)
+    
+    # 컴포넌트별 최소 인덱스를 대표로
+    representative = np.full(components.max() + 1, n)
+    np.minimum.at(representative, components, np.arange(n))
+    return np.where(visited, representative[components], -1)
+
+
+def remove_duplicates_by_similarity(df, threshold=0.8, seeds=None):
+    """
+    유사도 기반 중복 제거
+    - 클러스터별 가장 앞 순서 기사만 남기고 노출 횟수 합산
+    - seeds(행 위치) 지정 시: seeds와 연결된 클러스터의 대표만 반환
+    """
+    if df.empty or (len(df) < 2 and seeds is None):
+        return df
+    
+    df = df.copy(deep=False)
     
-    texts = df.apply(get_compare_text, axis=1).tolist()
+    texts = [get_compare_text(title, snippet) for title, snippet in zip(df["title"], df["snippet"])]
     
     if all(t.strip() == "" for t in texts):
         return df
@@ -75,20 +309,20 @@ def remove_duplicates_by_similarity(df, threshold=0.8):
     try:
         vectorizer = TfidfVectorizer()
         tfidf_matrix = vectorizer.fit_transform(texts)
-        sim_matrix = cosine_similarity(tfidf_matrix)
         
-        to_remove = set()
-        for i in range(len(sim_matrix)):
-            if i in to_remove:
-                continue
-            for j in range(i + 1, len(sim_matrix)):
-                if sim_matrix[i][j] >= threshold:
-                    to_remove.add(j)
+        # 유사 쌍 → 클러스터 (대표 = 가장 앞 순서 기사)
+        labels = cluster_similar(tfidf_matrix, threshold, seeds=seeds)
+        keep = labels == np.arange(len(texts))
+        removed = int((labels >= 0).sum() - keep.sum())
         
-        df = df.drop(df.index[list(to_remove)])
+        # 클러스터 노출 횟수 합산 (대표 기사에 반영)
+        if "exposure_count" in df.columns:
+            df["exposure_count"] = df["exposure_count"].groupby(labels).transform("sum").to_numpy()
+        
+        df = df[keep]
         df = df.reset_index(drop=True)
         
-        print(f"🧹 유사도 중복 제거: {len(to_remove)}건")
+        print(f"🧹 유사도 중복 제거: {removed}건")
         
     except Exception as e:
         print(f"⚠️ 유사도 계산 실패: {e}")
@@ -101,7 +335,12 @@ def count_exposures(df):
     if df.empty:
         return df
     
-    df = df.copy()
+    # crawl_all 집계 결과가 있으면 그대로 사용
+    if "exposure_count" in df.columns:
+        print(f"📊 노출 횟수: 수집 단계 집계 사용")
+        return df
+    
+    df = df.copy(deep=False)
     exposure_counts = df.groupby("link").size().to_dict()
     df["exposure_count"] = df["link"].map(exposure_counts)
     
@@ -124,95 +363,41 @@ def calculate_strategy_score(df):
     if df.empty:
         return df
     
-    df = df.copy()
-    combo_scores = SCORE_CONFIG["combo_scores"]
-    weights = SCORE_CONFIG["weights"]
-    
-    # 키워드 리스트 생성
-    all_main_product_kw = [kw for kws in MAIN_PRODUCT.values() for kw in kws]
-    all_main_company_kw = [kw for kws in MAIN_COMPANY.values() for kw in kws]
-    all_bonus_product_kw = [kw for kws in BONUS_PRODUCT.values() for kw in kws]
-    all_bonus_company_kw = [kw for kws in BONUS_COMPANY.values() for kw in kws]
+    df = df.copy(deep=False)
+    if "age_hours" not in df.columns:
+        df = add_date_columns(df)
     
     # ============================================================
-    # 1. 각 카테고리 포함 여부 체크
+    # 1. 각 카테고리 포함 여부 체크 (키워드 매칭 1회)
     # ============================================================
-    def check_categories(row):
-        text = f"{row.get('title', '')} {row.get('snippet', '')}"
-        
-        # 매칭된 Main 제품 카테고리
-        matched_main_product = [cat for cat, kws in MAIN_PRODUCT.items() 
-                               if any(check_keyword_in_text(text, kw) for kw in kws)]
-        
-        # 매칭된 Main 회사 카테고리
-        matched_main_company = [cat for cat, kws in MAIN_COMPANY.items() 
-                               if any(check_keyword_in_text(text, kw) for kw in kws)]
-        
-        # 매칭된 Bonus 제품 카테고리
-        matched_bonus_product = [cat for cat, kws in BONUS_PRODUCT.items() 
-                                if any(check_keyword_in_text(text, kw) for kw in kws)]
-        
-        # 매칭된 Bonus 회사 카테고리
-        matched_bonus_company = [cat for cat, kws in BONUS_COMPANY.items() 
-                                if any(check_keyword_in_text(text, kw) for kw in kws)]
-        
-        return pd.Series({
-            "has_main_product": len(matched_main_product) > 0,
-            "has_main_company": len(matched_main_company) > 0,
-            "has_bonus_product": len(matched_bonus_product) > 0,
-            "has_bonus_company": len(matched_bonus_company) > 0,
-            "main_keywords": ", ".join(matched_main_product + matched_main_company),
-            "bonus_keywords": ", ".join(matched_bonus_product + matched_bonus_company),
-        })
-    
-    category_flags = df.apply(check_categories, axis=1)
+    category_flags = match_keywords(df)
     df = pd.concat([df, category_flags], axis=1)
     
     # ============================================================
-    # 2. 조합별 점수 계산
+    # 2. 조합별 점수 계산 (벡터 연산)
     # ============================================================
-    def combo_score(row):
-        mp = row["has_main_product"]
-        mc = row["has_main_company"]
-        bp = row["has_bonus_product"]
-        bc = row["has_bonus_company"]
-        
-        # 1순위: Main제품 + Main회사
-        if mp and mc:
-            return combo_scores["main_product_main_company"], 1
-        
-        # 2순위: Main제품 + Bonus회사(경쟁사)
-        if mp and bc:
-            return combo_scores["main_product_bonus_company"], 2
-        
-        # 3순위: Main회사 + Bonus제품
-        if mc and bp:
-            return combo_scores["main_company_bonus_product"], 3
-        
-        # 4순위: Main제품 or Main회사만
-        if mp or mc:
-            return combo_scores["main_only"], 4
-        
-        # 5순위: Bonus제품 + Bonus회사
-        if bp and bc:
-            return combo_scores["bonus_product_bonus_company"], 5
-        
-        # 6순위: Bonus회사만 (경쟁사 동향)
-        if bc:
-            return combo_scores["bonus_company_only"], 6
-        
-        # 제외: Bonus제품만
-        return 0, 99
+    mp = df["has_main_product"].to_numpy(dtype=bool)
+    mc = df["has_main_company"].to_numpy(dtype=bool)
+    bp = df["has_bonus_product"].to_numpy(dtype=bool)
+    bc = df["has_bonus_company"].to_numpy(dtype=bool)
+    
+    combo_conditions = [
+        mp & mc,    # 1순위: Main제품 + Main회사
+        mp & bc,    # 2순위: Main제품 + Bonus회사(경쟁사)
+        mc & bp,    # 3순위: Main회사 + Bonus제품
+        mp | mc,    # 4순위: Main제품 or Main회사만
+        bp & bc,    # 5순위: Bonus제품 + Bonus회사
+        bc,         # 6순위: Bonus회사만 (경쟁사 동향)
+    ]
     
-    combo_results = df.apply(combo_score, axis=1)
-    df["score_combo"] = combo_results.apply(lambda x: x[0])
-    df["rank_combo"] = combo_results.apply(lambda x: x[1])
+    # 제외: Bonus제품만 (rank 99)
+    df["rank_combo"] = np.select(combo_conditions, [1, 2, 3, 4, 5, 6], default=99)
     
     # ============================================================
     # 3. Bonus 단독 기사 제외 (rank 99)
     # ============================================================
     before_filter = len(df)
-    df = df[df["rank_combo"] < 99].copy()
+    df = df[df["rank_combo"] < 99].copy(deep=False)
     after_filter = len(df)
     print(f"🔒 Main Keyword 필터: {before_filter}건 → {after_filter}건")
     
@@ -220,97 +405,91 @@ def calculate_strategy_score(df):
         print("⚠️ 유효한 기사 없음")
         return df
     
+    if "exposure_count" not in df.columns:
+        df["exposure_count"] = 1
+    
     # ============================================================
-    # 4. 제목 가산점
+    # 경쟁사 포함 기사 최신 가산점 (2순위, 5순위, 6순위)
     # ============================================================
-    def title_boost(row):
-        title = row.get("title", "")
-        
-        all_main_kw = all_main_product_kw + all_main_company_kw
-        if any(check_keyword_in_text(title, kw) for kw in all_main_kw):
-            return weights["title_boost"]
-        return 0
+    age_hours = df["age_hours"].to_numpy(dtype=float)
+    is_competitor_rank = np.isin(df["rank_combo"].to_numpy(), [2, 5, 6])
     
-    df["score_title"] = df.apply(title_boost, axis=1)
+    # 오늘 3점 / 어제 2점 / 2일 전 1점 (발행 시각 모르면 0점)
+    recency_boost = np.select([age_hours < 24, age_hours < 48, age_hours < 72], [3.0, 2.0, 1.0], default=0.0)
+    df["score_recency_boost"] = np.where(is_competitor_rank, recency_boost, 0.0)
     
     # ============================================================
-    # 5. 경쟁사 복수 등장 가산점
+    # 7. 신선도 (곱하기)
     # ============================================================
-    def multi_competitor_score(row):
-        text = f"{row.get('title', '')} {row.get('snippet', '')}"
-        
-        count = sum(1 for kw in all_bonus_company_kw if check_keyword_in_text(text, kw))
-        
-        if count >= 2:
-            return (count - 1) * weights["multi_competitor"]
-        return 0
+    # 발행 시각을 모르면 7일 전으로 간주
+    days = np.where(np.isnan(age_hours), 7.0, np.maximum(0.0, np.floor(age_hours / 24)))
+    df["recency_mult"] = SCORE_CONFIG["recency_base"] / (1.0 + SCORE_CONFIG["recency_decay"] * days)
     
-    df["score_multi_comp"] = df.apply(multi_competitor_score, axis=1)
+    # ============================================================
+    # 8. 소스 신뢰도 (곱하기)
+    # ============================================================
+    df["source_mult"] = df["source"].map(SOURCE_PRIORITY).astype(float).fillna(1.0)
     
     # ============================================================
-    # 6. 노출 횟수 점수
+    # 4-6. 가중치 반영 + 정렬
     # ============================================================
-    if "exposure_count" not in df.columns:
-        df["exposure_count"] = 1
+    df = apply_score_weights(df)
     
-    df["score_exposure"] = np.log1p(df["exposure_count"]) * weights["exposure_count"]
+    print(f"📊 전략 점수 계산 완료")
+    return df
+
+
+# 조합 순위 → combo_scores 키
+COMBO_KEYS = [
+    "main_product_main_company",
+    "main_product_bonus_company",
+    "main_company_bonus_product",
+    "main_only",
+    "bonus_product_bonus_company",
+    "bonus_company_only",
+]
 
+# 가중치와 무관한 점수 구성 요소 (재정렬용으로 보관)
+SCORE_COMPONENT_COLUMNS = [
+    "rank_combo", "title_main_hit", "competitor_count", "exposure_count",
+    "score_recency_boost", "recency_mult", "source_mult",
+]
+
+
+def apply_score_weights(df, combo_scores=None, weights=None):
+    """
+    구성 요소 컬럼 → 가중치 반영 점수 + 정렬
+    - 키워드 매칭/날짜 계산 없이 재계산 (재정렬용)
+    """
+    if combo_scores is None:
+        combo_scores = SCORE_CONFIG["combo_scores"]
+    if weights is None:
+        weights = SCORE_CONFIG["weights"]
+    
+    df = df.copy(deep=False)
+    
     # ============================================================
-    # 경쟁사 포함 기사 최신 가산점 (2순위, 5순위, 6순위)
+    # 조합별 점수
     # ============================================================
-    def competitor_recency_boost(row):
-        # 경쟁사 포함된 순위만 (2, 5, 6순위)
-        if row["rank_combo"] not in [2, 5, 6]:
-            return 0
-        
-        date_str = str(row.get("date", "")).lower()
-        
-        # 오늘/어제 기사면 추가 가산
-        if "hour" in date_str or "시간" in date_str or "분" in date_str:
-            return 3.0  # 오늘 기사
-        elif "1 day" in date_str or "1일" in date_str:
-            return 2.0  # 어제 기사
-        elif "2 day" in date_str or "2일" in date_str:
-            return 1.0  # 2일 전
-        
-        return 0
-    
-    df["score_recency_boost"] = df.apply(competitor_recency_boost, axis=1)
+    combo_values = np.array([combo_scores[k] for k in COMBO_KEYS] + [0.0])
+    rank_combo = df["rank_combo"].to_numpy()
+    df["score_combo"] = combo_values[np.where(rank_combo < 99, rank_combo - 1, len(COMBO_KEYS))]
     
     # ============================================================
-    # 7. 신선도 (곱하기)
+    # 4. 제목 가산점
     # ============================================================
-    def recency_multiplier(date_str):
-        if not date_str:
-            return 1.0
-        
-        date_str = str(date_str).lower()
-        days = 7
-        
-        try:
-            if "hour" in date_str or "시간" in date_str or "분" in date_str:
-                days = 0
-            elif "day" in date_str or "일" in date_str:
-                nums = re.findall(r'\d+', date_str)
-                days = int(nums[0]) if nums else 1
-            elif "week" in date_str or "주" in date_str:
-                nums = re.findall(r'\d+', date_str)
-                days = (int(nums[0]) if nums else 1) * 7
-            elif "month" in date_str or "달" in date_str or "개월" in date_str:
-                days = 30
-        except:
-            days = 7
-        
-        base = SCORE_CONFIG["recency_base"]
-        decay = SCORE_CONFIG["recency_decay"]
-        return base / (1.0 + decay * days)
+    df["score_title"] = np.where(df["title_main_hit"].to_numpy(dtype=bool), weights["title_boost"], 0.0)
     
-    df["recency_mult"] = df["date"].apply(recency_multiplier)
+    # ============================================================
+    # 5. 경쟁사 복수 등장 가산점 (2개 이상부터 개당)
+    # ============================================================
+    competitor_count = df["competitor_count"].to_numpy()
+    df["score_multi_comp"] = np.where(competitor_count >= 2, (competitor_count - 1) * weights["multi_competitor"], 0.0)
     
     # ============================================================
-    # 8. 소스 신뢰도 (곱하기)
+    # 6. 노출 횟수 점수
     # ============================================================
-    df["source_mult"] = df["source"].map(SOURCE_PRIORITY).fillna(1.0)
+    df["score_exposure"] = np.log1p(df["exposure_count"]) * weights["exposure_count"]
     
     # ============================================================
     # 최종 점수 계산
@@ -322,15 +501,102 @@ def calculate_strategy_score(df):
         df["score_exposure"] +
         df["score_recency_boost"]
     )
-    
     df["strategy_score"] = df["base_score"] * df["recency_mult"] * df["source_mult"]
     
     # 정렬: 1차 rank_combo(순위), 2차 strategy_score(점수)
     df = df.sort_values(["rank_combo", "strategy_score"], ascending=[True, False])
+    return df.reset_index(drop=True)
+
+
+def rerank(df, combo_scores=None, weights=None, top_n=None):
+    """
+    저장된 점수 구성 요소로 즉시 재정렬 (재수집 없이)
+    - df: calculate_strategy_score 결과 (Top N 추출 전 후보 전체)
+    """
+    if df is None or df.empty:
+        return df
+    
+    return get_top_articles(apply_score_weights(df, combo_scores, weights), top_n)
+
+
+def save_score_table(df, period_label="", path=None):
+    """점수 후보 테이블 저장 (다음 실행에서 재정렬)"""
+    path = path or PIPELINE_CONFIG.get("score_table_path", "./cache/score_table.pkl")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"period_label": period_label, "saved_at": datetime.now(), "table": df}, f)
+    os.replace(tmp_path, path)
+    print(f"💾 점수 테이블 저장: {len(df)}건")
+
+
+def load_score_table(path=None):
+    """저장된 점수 후보 테이블 로드 (없거나 실패 시 None)"""
+    path = path or PIPELINE_CONFIG.get("score_table_path", "./cache/score_table.pkl")
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+    except Exception as e:
+        print(f"⚠️ 점수 테이블 로드 실패: {e}")
+        return None
+    
+    missing = [c for c in SCORE_COMPONENT_COLUMNS if c not in saved["table"].columns]
+    if missing:
+        print(f"⚠️ 점수 테이블 컬럼 누락: {missing}")
+        return None
+    return saved
+
+
+def rank_with_candidate_pool(df, top_n=None, threshold=None, pool_factor=None):
+    """
+    저비용 우선 파이프라인
+    1. 키워드/소스 점수 계산 → rank 99 제외
+    2. 상위 top_n × pool_factor 후보와 연결된 유사 클러스터만 중복 제거
+       (TF-IDF는 전체 후보 기준, 대표/노출 합산은 전체 중복 제거와 동일)
+    3. 병합된 노출 횟수로 재계산
+    - 중복 제거 후 top_n 미만이면 후보 풀을 2배씩 확대
+    - 반환: 점수순 후보 풀 전체 (Top N 추출/재정렬은 호출 측)
+    """
+    if top_n is None:
+        top_n = SCORE_CONFIG["top_n"]
+    if threshold is None:
+        threshold = SCORE_CONFIG["similarity_threshold"]
+    if pool_factor is None:
+        pool_factor = PIPELINE_CONFIG.get("candidate_pool_factor", 4)
+    
+    if df.empty:
+        return df
+    
     df = df.reset_index(drop=True)
     
-    print(f"📊 전략 점수 계산 완료")
-    return df
+    # 1차 점수 (rank 99 제외) → 후보 행 위치, 점수 순
+    df["crawl_order"] = np.arange(len(df))
+    scored = calculate_strategy_score(df)
+    if scored.empty:
+        return scored.drop(columns=["crawl_order"])
+    ranked_positions = scored["crawl_order"].to_numpy()
+    
+    # 중복 제거는 전체 기사(수집 순) 기준 → 전체 실행과 같은 TF-IDF/대표 선택
+    articles = df.drop(columns=["crawl_order"])
+    
+    pool_size = max(top_n, top_n * pool_factor)
+    while True:
+        seeds = ranked_positions[:pool_size]
+        deduped = remove_duplicates_by_similarity(articles, threshold, seeds=seeds)
+        result = calculate_strategy_score(deduped)
+        
+        if len(result) >= top_n or pool_size >= len(ranked_positions):
+            break
+        pool_size *= 2
+    
+    print(f"⚡ 후보 풀: 후보 {len(ranked_positions)}건 중 상위 {min(pool_size, len(ranked_positions))}건 기준 중복 제거")
+    return result
 
 
 def get_top_articles(df, top_n=None):
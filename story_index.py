@@ -0,0 +1,230 @@
+"""
+보고 이력 인덱스 (MinHash-LSH)
+- 최근 N일간 보고한 기사의 지문(제목 + 스니펫 앞부분) 저장
+- 신규 기사 중 이미 보고한 기사와 유사한 것은 제외 또는 후속 기사로 표시
+"""
+
+import os
+import time
+import zlib
+import numpy as np
+from config import HISTORY_CONFIG
+from processor import get_compare_text
+
+# MinHash 해시 (a * x + b) mod p
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHashLSH:
+    """
+    MinHash 서명 + LSH 밴드 버킷
+    - num_perm: 서명 길이
+    - bands: 밴드 수 (num_perm을 나눠떨어지게)
+    - 같은 seed면 실행 간 서명이 동일 (토큰 해시는 crc32)
+    """
+    
+    def __init__(self, num_perm=64, bands=16, seed=42):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        
+        self.signatures = np.empty((0, num_perm), dtype=np.uint64)
+        self.reported_at = np.empty(0, dtype=np.float64)
+        self.titles = []
+        self.links = []
+        self.buckets = {}
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    def signature(self, text):
+        """텍스트 → MinHash 서명 (토큰 없으면 None)"""
+        tokens = set(text.split())
+        if not tokens:
+            return None
+        
+        hashes = np.array([zlib.crc32(t.encode("utf-8")) for t in tokens], dtype=np.uint64)
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=1)
+    
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+    
+    def _index_row(self, row):
+        for key in self._band_keys(self.signatures[row]):
+            self.buckets.setdefault(key, []).append(row)
+    
+    def add(self, signature, title, link, reported_at=None):
+        row = len(self.titles)
+        self.signatures = np.vstack([self.signatures, signature[None, :]])
+        self.reported_at = np.append(self.reported_at, reported_at or time.time())
+        self.titles.append(title)
+        self.links.append(link)
+        self._index_row(row)
+    
+    def query(self, signature, threshold, before=None):
+        """
+        가장 유사한 보고 기사 (추정 Jaccard ≥ threshold)
+        - before: 이 시각 이전에 보고된 기사만 대상
+        - 반환: (행 번호, 유사도) 또는 None
+        """
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+        
+        if before is not None:
+            candidates = [row for row in candidates if self.reported_at[row] < before]
+        if not candidates:
+            return None
+        
+        candidates = np.fromiter(candidates, dtype=np.int64)
+        similarity = (self.signatures[candidates] == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        if similarity[best] < threshold:
+            return None
+        return int(candidates[best]), float(similarity[best])
+    
+    def expire(self, max_age_seconds):
+        """오래된 보고 이력 삭제 후 버킷 재구성"""
+        keep = self.reported_at >= time.time() - max_age_seconds
+        if keep.all():
+            return
+        
+        self.signatures = self.signatures[keep]
+        self.reported_at = self.reported_at[keep]
+        self.titles = [t for t, k in zip(self.titles, keep) if k]
+        self.links = [l for l, k in zip(self.links, keep) if k]
+        self.buckets = {}
+        for row in range(len(self.titles)):
+            self._index_row(row)
+    
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            signatures=self.signatures,
+            reported_at=self.reported_at,
+            titles=np.array(self.titles, dtype=str),
+            links=np.array(self.links, dtype=str),
+        )
+        os.replace(tmp_path, path)
+    
+    def load(self, path):
+        with np.load(path, allow_pickle=False) as data:
+            if data["signatures"].shape[1] != self.num_perm:
+                print("⚠️ 보고 이력 인덱스 설정 변경 → 새로 생성")
+                return
+            self.signatures = data["signatures"]
+            self.reported_at = data["reported_at"]
+            self.titles = data["titles"].tolist()
+            self.links = data["links"].tolist()
+        
+        self.buckets = {}
+        for row in range(len(self.titles)):
+            self._index_row(row)
+
+
+def get_history_scope(period):
+    """
+    검색 기간 → 보고 이력 범위 (일간/주간/월간 보고서가 서로의 이력으로 제외되지 않게)
+    - 범위가 없는 기간(올해, 직접 지정 등)은 None → 이력 미적용
+    """
+    if period is None:
+        return None
+    return HISTORY_CONFIG.get("scopes", {}).get(period)
+
+
+def get_history_path(scope):
+    """범위별 이력 파일 경로"""
+    base, ext = os.path.splitext(HISTORY_CONFIG.get("path", "./cache/story_index.npz"))
+    return f"{base}_{scope}{ext}"
+
+
+def load_story_index(path=None, scope="daily"):
+    """보고 이력 인덱스 로드 (만료 이력 제거)"""
+    path = path or get_history_path(scope)
+    days = HISTORY_CONFIG.get("scope_days", {}).get(scope, HISTORY_CONFIG.get("days", 14))
+    index = MinHashLSH(HISTORY_CONFIG.get("num_perm", 64), HISTORY_CONFIG.get("bands", 16))
+    
+    if os.path.exists(path):
+        try:
+            index.load(path)
+        except Exception as e:
+            print(f"⚠️ 보고 이력 인덱스 로드 실패: {e}")
+    
+    index.expire(days * 86400)
+    return index
+
+
+def suppress_reported_stories(df, scope, index=None):
+    """
+    이미 보고한 기사 처리 (점수 계산 전)
+    - scope: 이력 범위 (get_history_scope, None이면 미적용)
+    - mode "drop": 제외
+    - mode "flag": follow_up / reported_title 컬럼으로 후속 기사 표시
+    - 최근 min_age_hours 이내 보고분은 제외 (같은 날 재실행 대비)
+    """
+    if df.empty or scope is None or not HISTORY_CONFIG.get("enabled", True):
+        return df
+    
+    if index is None:
+        index = load_story_index(scope=scope)
+    
+    df = df.copy(deep=False)
+    threshold = HISTORY_CONFIG.get("threshold", 0.6)
+    before = time.time() - HISTORY_CONFIG.get("min_age_hours", 12) * 3600
+    
+    # 비교 텍스트 보관 (본문 수집 후 snippet이 바뀌어도 같은 지문으로 저장)
+    df["compare_text"] = [get_compare_text(title, snippet) for title, snippet in zip(df["title"], df["snippet"])]
+    
+    matched_titles = []
+    for text in df["compare_text"]:
+        signature = index.signature(text)
+        match = index.query(signature, threshold, before) if signature is not None else None
+        matched_titles.append(index.titles[match[0]] if match else "")
+    
+    df["reported_title"] = matched_titles
+    df["follow_up"] = df["reported_title"] != ""
+    matched = int(df["follow_up"].sum())
+    
+    if HISTORY_CONFIG.get("mode", "drop") == "drop":
+        df = df[~df["follow_up"]].drop(columns=["reported_title", "follow_up"])
+        df = df.reset_index(drop=True)
+        print(f"🗂️ 보고 이력 중복 제외: {matched}건")
+    else:
+        print(f"🗂️ 보고 이력 후속 기사 표시: {matched}건")
+    
+    return df
+
+
+def record_reported_stories(df, scope, path=None):
+    """최종 보고 기사 이력 저장 (scope: 이력 범위, None이면 저장 안 함)"""
+    if df.empty or scope is None or not HISTORY_CONFIG.get("enabled", True):
+        return
+    
+    path = path or get_history_path(scope)
+    index = load_story_index(path, scope)
+    now = time.time()
+    
+    if "compare_text" in df.columns:
+        texts = df["compare_text"].fillna("").tolist()
+    else:
+        texts = [get_compare_text(title, snippet) for title, snippet in zip(df["title"], df["snippet"])]
+    
+    for text, title, link in zip(texts, df["title"], df["link"]):
+        signature = index.signature(text)
+        if signature is not None:
+            index.add(signature, str(title), str(link), now)
+    
+    index.save(path)
+    print(f"🗂️ 보고 이력 저장: {len(df)}건 (누적 {len(index)}건)")
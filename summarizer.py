@@ -1,61 +1,539 @@
 """
 GPT 기반 뉴스 요약
+- 비동기 엔진: 공유 클라이언트 1개 + 동시 요청 수 제한 + RPM/TPM 토큰 버킷
+- 요청별 타임아웃, 결과는 행 순서대로
+- 요약 캐시: 요청 내용 해시 키 (같은 기사/설정이면 API 호출 없음)
+- 추출 요약: 네트워크 없이 본문 핵심 문장 선택 (AI 요약 제외/API 키 없음/LLM 실패 시)
 """
 
+import asyncio
+import hashlib
+import json
+import os
+import threading
 import time
-from openai import OpenAI
-from config import SUMMARY_CONFIG
+import pandas as pd
+from openai import OpenAI, AsyncOpenAI
+from config import SUMMARY_CONFIG, CACHE_CONFIG
+from cache import SqliteCache
+from condenser import condense_text, count_tokens, select_sentences, remove_boilerplate, truncate_tokens
+from crawler import get_article_cache
+
+
+def build_messages(title, snippet, full_text):
+    """
+    요약 요청 메시지 (본문이 있으면 본문, 없으면 snippet)
+    - reduce_input: 보일러플레이트 제거 + 토큰 예산 내 핵심 문장 선택
+    """
+    content = full_text if full_text else snippet
+    if SUMMARY_CONFIG.get("reduce_input", True):
+        content = condense_text(title, content)
+    else:
+        content = content[:2000]
+    text = f"제목: {title}\n내용: {content}"
+    return [
+        {"role": "system", "content": SUMMARY_CONFIG["system_prompt"]},
+        {"role": "user", "content": text},
+    ]
+
+
+def estimate_tokens(messages, max_tokens=None):
+    """요청 토큰 수 (TPM 제한/배치 예산용, 입력 + 출력 상한)"""
+    if max_tokens is None:
+        max_tokens = SUMMARY_CONFIG["max_tokens"]
+    return sum(count_tokens(message["content"]) for message in messages) + max_tokens
+
+
+# ============================================================
+# 추출 요약 (오프라인)
+# ============================================================
+def extractive_summary(title, snippet, full_text, max_sentences=None):
+    """
+    추출 요약 (네트워크 없음)
+    - 제목 + 등장 키워드 기준 snippet/본문 문장 점수 → 상위 2~3문장 (원래 순서)
+    - 원문 언어 그대로 (한글 기사는 한글, 영문 기사는 영문)
+    - 문장이 없으면 snippet/제목 앞부분
+    """
+    if max_sentences is None:
+        max_sentences = SUMMARY_CONFIG.get("extractive_sentences", 3)
+    budget = SUMMARY_CONFIG.get("extractive_token_budget", 200)
+    
+    snippet = snippet if isinstance(snippet, str) else ""
+    full_text = full_text if isinstance(full_text, str) else ""
+    # snippet이 본문 첫머리와 같으면 본문만 사용
+    parts = [full_text] if full_text and snippet[:30] in full_text else [snippet, full_text]
+    text = "\n".join(part for part in parts if part)
+    
+    selected = select_sentences(title, text, budget, max_sentences)
+    if selected:
+        return " ".join(selected)
+    return truncate_tokens(" ".join(remove_boilerplate(text or title).split()), budget)
+
+
+def load_full_text(row, cache):
+    """본문 (기사 캐시만 조회, 캐시에 없으면 다운로드하지 않음)"""
+    has_full_text = row.get("has_full_text", False)
+    if pd.notna(has_full_text) and has_full_text:
+        return cache.get(row["link"]) or ""
+    return row.get("full_text", "")
+
+
+def extractive_dataframe(df):
+    """DataFrame 전체 추출 요약"""
+    df = df.copy(deep=False)
+    start = time.perf_counter()
+    cache = get_article_cache()
+    df["summary"] = [
+        extractive_summary(row.get("title", ""), row.get("snippet", ""), load_full_text(row, cache))
+        for _, row in df.iterrows()
+    ]
+    print(f"📝 추출 요약 완료: {len(df)}건 ({time.perf_counter() - start:.2f}초)")
+    return df
+
+
+def fill_missing_summaries(df):
+    """
+    요약 없는 기사만 추출 요약 (재정렬로 Top N에 새로 들어온 기사)
+    - 본문은 기사 캐시에 있을 때만 사용 (네트워크 없음)
+    - 반환: (DataFrame, 채운 건수)
+    """
+    if df is None or df.empty:
+        return df, 0
+    
+    if "summary" in df.columns:
+        summaries = df["summary"].astype(object)
+    else:
+        summaries = pd.Series(None, index=df.index, dtype=object)
+    missing = summaries.isna()
+    if not missing.any():
+        return df, 0
+    
+    cache = get_article_cache()
+    summaries[missing] = [
+        extractive_summary(row.get("title", ""), row.get("snippet", ""), cache.get(row["link"]) or "")
+        for _, row in df[missing].iterrows()
+    ]
+    
+    df = df.copy(deep=False)
+    df["summary"] = summaries
+    return df, int(missing.sum())
+
+
+# ============================================================
+# 요약 캐시
+# ============================================================
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache():
+    """요약 디스크 캐시 (요청 해시 키, 최초 1회 생성)"""
+    global _summary_cache
+    
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = SqliteCache(
+                os.path.join(CACHE_CONFIG.get("dir", "./cache"), "summaries.db"),
+                ttl_seconds=CACHE_CONFIG.get("summary_ttl_days", 30) * 86400,
+                max_bytes=CACHE_CONFIG.get("summary_max_mb", 50) * 1024 * 1024,
+            )
+        return _summary_cache
+
+
+def summary_cache_key(messages):
+    """
+    요약 캐시 키
+    - 제목 + 잘린 내용 + 시스템 프롬프트(메시지) + 모델 + max_tokens 해시
+    """
+    payload = json.dumps(
+        [SUMMARY_CONFIG["model"], SUMMARY_CONFIG["max_tokens"], messages],
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def store_summary(key, summary):
+    """성공한 요약만 저장 ("요약 실패"는 저장 안 함)"""
+    if summary and not summary.startswith("요약 실패"):
+        get_summary_cache().set(key, summary)
+
+
+def client_options(api_key):
+    """OpenAI 클라이언트 옵션 (base_url 지정 시 로컬 스텁/호환 서버)"""
+    options = {
+        "api_key": api_key,
+        "timeout": SUMMARY_CONFIG.get("timeout", 30),
+        "max_retries": SUMMARY_CONFIG.get("max_retries", 2),
+    }
+    if SUMMARY_CONFIG.get("base_url"):
+        options["base_url"] = SUMMARY_CONFIG["base_url"]
+    return options
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key):
+    """동기 클라이언트 (API 키별 1개 재사용)"""
+    with _clients_lock:
+        if api_key not in _clients:
+            _clients[api_key] = OpenAI(**client_options(api_key))
+        return _clients[api_key]
 
 
 def summarize_article(title, snippet, full_text, api_key):
     """
     단일 기사 요약
     """
-    client = OpenAI(api_key=api_key)
+    messages = build_messages(title, snippet, full_text)
+    key = summary_cache_key(messages)
+    cached = get_summary_cache().get(key)
+    if cached is not None:
+        return cached
     
-    # 본문이 있으면 본문 사용, 없으면 snippet 사용
-    content = full_text if full_text else snippet
-    text = f"제목: {title}\n내용: {content[:2000]}"
+    client = get_client(api_key)
     
     try:
         response = client.chat.completions.create(
             model=SUMMARY_CONFIG["model"],
-            messages=[
-                {"role": "system", "content": SUMMARY_CONFIG["system_prompt"]},
-                {"role": "user", "content": text}
-            ],
+            messages=messages,
             max_tokens=SUMMARY_CONFIG["max_tokens"],
             temperature=0.3
         )
-        return response.choices[0].message.content.strip()
-        
+        summary = response.choices[0].message.content.strip()
+        store_summary(key, summary)
+        return summary
+    
     except Exception as e:
         return f"요약 실패: {str(e)[:50]}"
 
 
-def summarize_dataframe(df, api_key, delay=1.0):
+# ============================================================
+# 비동기 요약 엔진
+# ============================================================
+class AsyncTokenBucket:
+    """
+    비동기 토큰 버킷
+    - per_minute: 분당 보충량 (RPM 또는 TPM)
+    - 용량 = 분당 보충량 (최대 1분치 버스트)
+    """
+    
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class SummaryRateLimiter:
+    """요청 수(RPM) + 토큰 수(TPM) 동시 제한"""
+    
+    def __init__(self, rpm, tpm):
+        self.requests = AsyncTokenBucket(rpm)
+        self.tokens = AsyncTokenBucket(tpm)
+        self.count = 0
+    
+    async def acquire(self, tokens):
+        self.count += 1
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+
+async def summarize_article_async(client, limiter, semaphore, messages):
+    """
+    단일 기사 비동기 요약
+    - 동시 요청 수(semaphore) 안에서 RPM/TPM 확보 후 요청
+    - 타임아웃/오류는 "요약 실패" 문자열
+    """
+    async with semaphore:
+        await limiter.acquire(estimate_tokens(messages))
+        try:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=SUMMARY_CONFIG["model"],
+                    messages=messages,
+                    max_tokens=SUMMARY_CONFIG["max_tokens"],
+                    temperature=0.3
+                ),
+                timeout=SUMMARY_CONFIG.get("timeout", 30),
+            )
+            return response.choices[0].message.content.strip()
+        
+        except asyncio.TimeoutError:
+            return "요약 실패: 시간 초과"
+        except Exception as e:
+            return f"요약 실패: {str(e)[:50]}"
+
+
+# ============================================================
+# 배치 요약 (여러 기사 → 요청 1회, JSON 배열 응답)
+# ============================================================
+BATCH_INSTRUCTION = """
+여러 기사가 [기사 번호]와 함께 주어집니다. 각 기사를 위 지침대로 따로 요약하세요.
+다른 설명 없이 JSON 배열로만 답하세요: [{"id": 기사 번호, "summary": "요약"}, ...]"""
+
+
+def build_batch_messages(batch):
+    """
+    배치 요청 메시지
+    - batch: [(기사 번호, 단건 요청 메시지), ...] (단건 user 내용 그대로 사용)
+    """
+    articles = "\n\n".join(f"[기사 {article_id}]\n{messages[-1]['content']}" for article_id, messages in batch)
+    return [
+        {"role": "system", "content": SUMMARY_CONFIG["system_prompt"] + "\n" + BATCH_INSTRUCTION},
+        {"role": "user", "content": articles},
+    ]
+
+
+def batch_max_tokens(size):
+    """배치 출력 상한 (기사당 max_tokens + JSON 여유)"""
+    return (SUMMARY_CONFIG["max_tokens"] + 30) * size
+
+
+def pack_batches(requests):
+    """
+    요청을 배치로 묶기 (입력 토큰 예산/기사 수 상한, 순서 유지)
+    - 반환: [[(요청 위치, 메시지), ...], ...]
+    """
+    budget = SUMMARY_CONFIG.get("batch_token_budget", 6000)
+    max_articles = max(1, SUMMARY_CONFIG.get("batch_max_articles", 8))
+    
+    batches = []
+    current = []
+    used = 0
+    for i, messages in enumerate(requests):
+        tokens = estimate_tokens(messages[-1:], max_tokens=0)
+        if current and (used + tokens > budget or len(current) >= max_articles):
+            batches.append(current)
+            current = []
+            used = 0
+        current.append((i, messages))
+        used += tokens
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(text, ids):
+    """
+    배치 응답 검증 → {기사 번호: 요약}
+    - JSON 배열, 요청한 번호, 비어있지 않은 문자열만 인정 (나머지는 누락 처리)
+    """
+    # 코드 블록 등 앞뒤 텍스트는 무시
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        return {}
+    
+    try:
+        items = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+    
+    summaries = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        article_id, summary = item.get("id"), item.get("summary")
+        if isinstance(article_id, str) and article_id.isdigit():
+            article_id = int(article_id)
+        if article_id in ids and isinstance(summary, str) and summary.strip():
+            summaries[article_id] = summary.strip()
+    return summaries
+
+
+async def summarize_batch_async(client, limiter, semaphore, batch):
+    """
+    배치 요약 (요청 1회)
+    - 응답이 깨졌거나 일부 누락이면 누락분을 반으로 나눠 재시도
+    - 1건만 남으면 단건 요청으로 대체
+    - 요청 자체 실패(인증/속도 제한/시간 초과 등)는 재분할 없이 배치 전체 "요약 실패"
+      (전송 재시도는 클라이언트 max_retries, 이후 추출 요약으로 대체)
+    - 반환: {요청 위치: 요약}
+    """
+    if len(batch) == 1:
+        i, messages = batch[0]
+        return {i: await summarize_article_async(client, limiter, semaphore, messages)}
+    
+    messages = build_batch_messages(batch)
+    max_tokens = batch_max_tokens(len(batch))
+    
+    async with semaphore:
+        await limiter.acquire(estimate_tokens(messages, max_tokens))
+        try:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=SUMMARY_CONFIG["model"],
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.3
+                ),
+                timeout=SUMMARY_CONFIG.get("timeout", 30),
+            )
+        except asyncio.TimeoutError:
+            return {i: "요약 실패: 시간 초과" for i, _ in batch}
+        except Exception as e:
+            return {i: f"요약 실패: {str(e)[:50]}" for i, _ in batch}
+    
+    parsed = parse_batch_response(response.choices[0].message.content or "", {i for i, _ in batch})
+    
+    missing = [(i, m) for i, m in batch if i not in parsed]
+    if missing:
+        mid = (len(missing) + 1) // 2
+        for part in (missing[:mid], missing[mid:]):
+            if part:
+                parsed.update(await summarize_batch_async(client, limiter, semaphore, part))
+    return parsed
+
+
+async def summarize_articles_async(requests, api_key):
+    """
+    기사 목록 동시 요약 (공유 클라이언트 1개)
+    - requests: 기사별 요청 메시지 목록 (build_messages)
+    - batch_mode: 여러 기사를 요청 1회로 묶어 전송
+    - deadline: 전체 마감 (초과 시 남은 요청 취소, 해당 기사는 None)
+    - 반환: (입력 순서대로 요약 목록, API 요청 수)
+    """
+    client = AsyncOpenAI(**client_options(api_key))
+    limiter = SummaryRateLimiter(SUMMARY_CONFIG.get("rpm", 500), SUMMARY_CONFIG.get("tpm", 200000))
+    semaphore = asyncio.Semaphore(max(1, SUMMARY_CONFIG.get("max_concurrency", 8)))
+    
+    batch_mode = SUMMARY_CONFIG.get("batch_mode", True)
+    
+    try:
+        if batch_mode:
+            tasks = [
+                asyncio.ensure_future(summarize_batch_async(client, limiter, semaphore, batch))
+                for batch in pack_batches(requests)
+            ]
+        else:
+            tasks = [
+                asyncio.ensure_future(summarize_article_async(client, limiter, semaphore, messages))
+                for messages in requests
+            ]
+        if not tasks:
+            return [], 0
+        
+        done, pending = await asyncio.wait(tasks, timeout=SUMMARY_CONFIG.get("deadline"))
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            print(f"⏰ 요약 마감 초과: 요청 {len(pending)}건 취소")
+        
+        if batch_mode:
+            results = {}
+            for task in tasks:
+                if task in done:
+                    results.update(task.result())
+            summaries = [results.get(i) for i in range(len(requests))]
+        else:
+            summaries = [task.result() if task in done else None for task in tasks]
+        return summaries, limiter.count
+    finally:
+        await client.close()
+
+
+def run_async(coroutine):
+    """
+    코루틴 실행 (이벤트 루프가 이미 돌고 있으면 별도 스레드에서)
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    
+    result = {}
+    
+    def runner():
+        result["value"] = asyncio.run(coroutine)
+    
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def summarize_dataframe(df, api_key, mode=None):
     """
     DataFrame 전체 기사 요약
+    - mode: "llm"(비동기 동시 요청) / "extractive"(추출 요약), None이면 설정값
+    - API 키가 없으면 추출 요약
+    - LLM 실패/마감 초과 기사는 추출 요약으로 대체 (요약 캐시에는 저장 안 함)
     """
     if df.empty:
         return df
     
-    df = df.copy()
-    summaries = []
+    if mode is None:
+        mode = SUMMARY_CONFIG.get("mode", "llm")
+    if mode == "extractive" or not api_key:
+        return extractive_dataframe(df)
+    
+    df = df.copy(deep=False)
+    results = [None] * len(df)
+    pending = []
+    requests = []
+    articles = []
+    keys = []
+    
+    cache = get_summary_cache()
+    cache.reset_stats()
+    article_cache = get_article_cache()
     
     total = len(df)
-    for idx, row in df.iterrows():
-        print(f"🤖 요약 [{idx+1}/{total}] {row['title'][:40]}...")
-        
-        summary = summarize_article(
-            title=row.get("title", ""),
-            snippet=row.get("snippet", ""),
-            full_text=row.get("full_text", ""),
-            api_key=api_key
-        )
-        summaries.append(summary)
-        time.sleep(delay)
+    for i, (_, row) in enumerate(df.iterrows()):
+        article = (row.get("title", ""), row.get("snippet", ""), load_full_text(row, article_cache))
+        messages = build_messages(*article)
+        
+        # 요약 캐시 (같은 요청 내용/설정)
+        cache_key = summary_cache_key(messages)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            results[i] = cached
+            continue
+        
+        pending.append(i)
+        requests.append(messages)
+        articles.append(article)
+        keys.append(cache_key)
     
-    df["summary"] = summaries
+    cache_stats = cache.stats()
+    print(f"💾 요약 캐시: 히트 {cache_stats['hits']} / 미스 {cache_stats['misses']}")
+    
+    if requests:
+        print(f"🤖 요약 요청: {len(requests)}건 (동시 {SUMMARY_CONFIG.get('max_concurrency', 8)}개)")
+        start = time.perf_counter()
+        new_summaries, request_count = run_async(summarize_articles_async(requests, api_key))
+        
+        fallback = 0
+        for i, cache_key, article, summary in zip(pending, keys, articles, new_summaries):
+            if summary is None or summary.startswith("요약 실패"):
+                summary = extractive_summary(*article)
+                fallback += 1
+            else:
+                store_summary(cache_key, summary)
+            results[i] = summary
+        
+        print(f"⏱️ 요약 소요: {time.perf_counter() - start:.1f}초 (API 요청 {request_count}회, 추출 요약 대체 {fallback}건)")
+    
+    df["summary"] = results
     print(f"✅ 요약 완료: {total}건")
-    return df
\ No newline at end of file
+    return df